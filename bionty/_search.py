@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from lamindb.base.types import StrField
+    from lamindb.models import QuerySet, SQLRecord
+
+# string fields of the tables that are covered by their search index, as created
+# by migration 0066, a search only uses the index if all searched fields are covered
+_ONTOLOGY_FIELDS = ("name", "ontology_id", "uid", "abbr", "synonyms", "description")
+SEARCH_INDEX_FIELDS: dict[str, tuple[str, ...]] = {
+    "bionty_organism": (*_ONTOLOGY_FIELDS, "scientific_name"),
+    "bionty_gene": (
+        "uid",
+        "abbr",
+        "synonyms",
+        "description",
+        "symbol",
+        "stable_id",
+        "ensembl_gene_id",
+        "ncbi_gene_ids",
+        "biotype",
+    ),
+    "bionty_protein": (
+        "uid",
+        "abbr",
+        "synonyms",
+        "description",
+        "name",
+        "uniprotkb_id",
+        "gene_symbol",
+        "ensembl_gene_ids",
+    ),
+    "bionty_cellmarker": (
+        "uid",
+        "abbr",
+        "synonyms",
+        "description",
+        "name",
+        "gene_symbol",
+        "ncbi_gene_id",
+        "uniprotkb_id",
+    ),
+    **{
+        f"bionty_{name}": _ONTOLOGY_FIELDS
+        for name in (
+            "tissue",
+            "celltype",
+            "disease",
+            "cellline",
+            "phenotype",
+            "pathway",
+            "experimentalfactor",
+            "developmentalstage",
+            "ethnicity",
+        )
+    },
+}
+
+# trigrams are only generated for strings of at least 3 characters
+MIN_INDEXED_QUERY_LENGTH = 3
+
+
+def _postgres_index_name(table: str) -> str:
+    return f"{table}_search_trgm"
+
+
+def _postgres_expression(connection: BaseDatabaseWrapper, fields: tuple[str, ...]):
+    """The indexed expression, queries have to use it verbatim to use the index."""
+    qn = connection.ops.quote_name
+    values = " || '|' || ".join(f"COALESCE({qn(field)}::text, '')" for field in fields)
+    return f"UPPER({values})"
+
+
+def _sqlite_fts_table(table: str) -> str:
+    return f"{table}_search"
+
+
+def _sqlite_triggers(table: str) -> list[str]:
+    return [f"{_sqlite_fts_table(table)}_{event}" for event in ("ai", "ad", "au")]
+
+
+def _has_search_index(connection: BaseDatabaseWrapper, table: str) -> bool:
+    if connection.vendor == "postgresql":
+        sql = "SELECT count(*) FROM pg_indexes WHERE indexname = %s"
+        names = [_postgres_index_name(table)]
+    elif connection.vendor == "sqlite":
+        # the triggers are dropped if the table is rebuilt by a later migration,
+        # then the index is stale and can't be used
+        names = [_sqlite_fts_table(table), *_sqlite_triggers(table)]
+        sql = f"SELECT count(*) FROM sqlite_master WHERE name IN ({', '.join(['%s'] * len(names))})"
+    else:
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(sql, names)
+        return cursor.fetchone()[0] == len(names)
+
+
+def search_field_names(
+    registry: type[SQLRecord], field: StrField | list[StrField] | None
+) -> list[str]:
+    """The fields searched by `SQLRecord.search`, all string fields by default."""
+    if field is None:
+        return [
+            f.name
+            for f in registry._meta.fields
+            if f.get_internal_type() in {"CharField", "TextField"}
+        ]
+    fields = field if isinstance(field, list) else [field]
+    return [f if isinstance(f, str) else f.field.name for f in fields]
+
+
+def filter_search_candidates(
+    queryset: QuerySet, string: str, fields: list[str]
+) -> QuerySet:
+    """Restrict a queryset to the records containing `string` according to the search index.
+
+    The candidates are a superset of the records that contain `string` in one of `fields`,
+    ignoring case. The queryset is returned unchanged if the search can't use the index.
+    """
+    from django.db import connections
+    from django.db.models.expressions import RawSQL
+
+    table = queryset.model._meta.db_table
+    indexed_fields = SEARCH_INDEX_FIELDS.get(table)
+    string = string.strip()
+    if (
+        indexed_fields is None
+        or len(string) < MIN_INDEXED_QUERY_LENGTH
+        or not set(fields).issubset(indexed_fields)
+    ):
+        return queryset
+
+    connection = connections[queryset.db]
+    if not _has_search_index(connection, table):
+        return queryset
+    qn = connection.ops.quote_name
+    if connection.vendor == "postgresql":
+        # fields are matched in the concatenation of all indexed fields
+        pattern = string.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        sql = (
+            f"SELECT id FROM {qn(table)} "
+            f"WHERE {_postgres_expression(connection, indexed_fields)} LIKE UPPER(%s)"
+        )
+        params = [f"%{pattern}%"]
+    else:
+        # a phrase matches as a substring with the trigram tokenizer
+        fts = _sqlite_fts_table(table)
+        sql = f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s"
+        params = ['"{}"'.format(string.replace('"', '""'))]
+    return queryset.filter(pk__in=RawSQL(sql, params))
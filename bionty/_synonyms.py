@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from lamindb.base.types import ListLike
+    from lamindb.models import QuerySet
+
+    from .models import BioRecord
+
+# number of records whose terms are replaced per query
+SYNONYM_INDEX_BATCH_SIZE = 5_000
+# standardizing more distinct values than this loads the whole registry,
+# which is also below the limits of query parameters of the databases
+MAX_INDEXED_VALUES = 20_000
+
+
+def record_terms(name: str | None, synonyms: str | None) -> list[str]:
+    """The lowercased terms of a record, its name always comes first.
+
+    Records without a name get an empty term, so that every indexed record has a row.
+    """
+    terms = [name.lower() if name else ""]
+    if synonyms:
+        terms += [synonym.lower() for synonym in synonyms.split("|") if synonym]
+    return list(dict.fromkeys(terms))
+
+
+def _triggers(table: str) -> list[str]:
+    """The triggers created by migration 0067 that mark stale records."""
+    return [f"{table}_synonym_{event}" for event in ("ai", "ad", "au")]
+
+
+def _has_synonym_triggers(connection: BaseDatabaseWrapper, table: str) -> bool:
+    names = _triggers(table)
+    placeholders = ", ".join(["%s"] * len(names))
+    if connection.vendor == "postgresql":
+        sql = f"SELECT count(*) FROM pg_trigger WHERE tgname IN ({placeholders})"
+    elif connection.vendor == "sqlite":
+        # the triggers are dropped if the table is rebuilt by a later migration,
+        # then records aren't marked as stale anymore and the index can't be used
+        sql = f"SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})"
+    else:
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(sql, names)
+        return cursor.fetchone()[0] == len(names)
+
+
+def index_records(registry: type[BioRecord], records: Iterable[BioRecord]) -> None:
+    """Replace the terms of saved records in the synonym index."""
+    from django.db import transaction
+
+    from .models import Synonym
+
+    entity = registry.__get_name_with_module__()
+    name_field = registry._name_field
+    records = [record for record in records if record.pk is not None]
+    for i in range(0, len(records), SYNONYM_INDEX_BATCH_SIZE):
+        batch = records[i : i + SYNONYM_INDEX_BATCH_SIZE]
+        rows = [
+            Synonym(registry=entity, record_id=record.pk, term=term)
+            for record in batch
+            for term in record_terms(
+                getattr(record, name_field, None), getattr(record, "synonyms", None)
+            )
+        ]
+        with transaction.atomic():
+            Synonym.objects.filter(
+                registry=entity, record_id__in=[record.pk for record in batch]
+            ).delete()
+            Synonym.objects.bulk_create(rows)
+
+
+def index_stale_records(registry: type[BioRecord]) -> None:
+    """Index the records that the triggers marked as stale, e.g. after bulk updates."""
+    from .models import Synonym
+
+    entity = registry.__get_name_with_module__()
+    stale = registry.objects.filter(
+        id__in=Synonym.objects.filter(registry=entity, term__isnull=True).values(
+            "record_id"
+        )
+    ).only("id", registry._name_field, "synonyms")
+    index_records(registry, stale)
+
+
+def _standardize_terms(values: ListLike) -> set[str]:
+    """The lowercased values, list values are flattened."""
+    if isinstance(values, str):
+        values = [values]
+    terms = set()
+    for value in values:
+        for item in value if isinstance(value, list) else [value]:
+            if item is not None:
+                terms.add(str(item).lower())
+    return terms
+
+
+def filter_standardize_candidates(queryset: QuerySet, values: ListLike) -> QuerySet:
+    """Restrict a queryset to the records whose name or synonyms match `values`, ignoring case.
+
+    Records that don't match any value don't change the result of standardizing `values`.
+    The queryset is returned unchanged if there are too many values to look up,
+    if the synonym index isn't kept up to date by triggers or if it has stale records,
+    which are only indexed by writes to the registry.
+    """
+    from django.db import connections
+
+    from .models import Synonym
+
+    registry = queryset.model
+    entity = registry.__get_name_with_module__()
+    terms = _standardize_terms(values)
+    if (
+        len(terms) > MAX_INDEXED_VALUES
+        or not _has_synonym_triggers(connections[queryset.db], registry._meta.db_table)
+        or Synonym.objects.filter(registry=entity, term__isnull=True).exists()
+    ):
+        return queryset
+    return queryset.filter(
+        id__in=Synonym.objects.filter(registry=entity, term__in=terms).values(
+            "record_id"
+        )
+    )
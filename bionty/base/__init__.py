@@ -19,6 +19,9 @@ Sources & settings
 
 .. autofunction:: display_sources
 .. autofunction:: display_currently_used_sources
+.. autofunction:: prefetch_sources
+.. autofunction:: export_cache_bundle
+.. autofunction:: import_cache_bundle
 .. autodata:: settings
 
 Base class
@@ -53,7 +56,9 @@ Entities
 
 # dynamic classes
 from . import dev
+from ._cache_bundle import export_cache_bundle, import_cache_bundle
 from ._display_sources import display_currently_used_sources, display_sources
+from ._prefetch import prefetch_sources
 
 # tools
 from ._public_ontology import PublicOntology, PublicOntologyField
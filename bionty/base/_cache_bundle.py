@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from pathlib import Path
+
+from ._settings import settings
+
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_MANIFEST = "manifest.json"
+
+
+def _is_bundled(path: Path) -> bool:
+    """Cached tables and their sidecar files, but no lock, temporary or stale files."""
+    from .dev._io import _read_md5_sidecar
+
+    if not (
+        path.is_file()
+        and path.name.startswith("df_")
+        and not path.name.endswith((".lock", ".checked", ".part", ".part.json", ".tmp"))
+    ):
+        return False
+    if path.name.endswith(".md5"):
+        # only sidecars written for the current content of their file
+        data_path = path.with_name(path.name.removesuffix(".md5"))
+        return data_path.exists() and _read_md5_sidecar(data_path) is not None
+    return True
+
+
+def _resign_md5_sidecar(sidecar_path: Path) -> None:
+    """Update the signature of a sidecar to its imported file, or drop it."""
+    data_path = sidecar_path.with_name(sidecar_path.name.removesuffix(".md5"))
+    if not data_path.exists():
+        sidecar_path.unlink()
+        return
+    stat = data_path.stat()
+    sidecar = json.loads(sidecar_path.read_text())
+    sidecar["signature"] = [stat.st_size, stat.st_mtime_ns]
+    sidecar_path.write_text(json.dumps(sidecar))
+
+
+def export_cache_bundle(
+    path: str | Path, *, cachedir: str | Path | None = None
+) -> Path:
+    """Export the cached tables into a bundle.
+
+    A bundle is a tar file with the parquet files of the cached tables, their
+    sidecar files and a manifest with the size and md5 checksum of each file.
+
+    Args:
+        path: Path of the bundle.
+        cachedir: Directory of the cached tables, defaults to `settings.dynamicdir`.
+
+    Returns:
+        The path of the bundle.
+
+    Example::
+
+        import bionty.base as bt_base
+
+        bt_base.prefetch_sources()
+        bt_base.export_cache_bundle("bionty-cache.tar")
+    """
+    from .dev._io import atomic_write, file_md5
+
+    path = Path(path)
+    cachedir = Path(cachedir) if cachedir is not None else settings.dynamicdir
+    files = sorted(file for file in cachedir.iterdir() if _is_bundled(file))
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "files": [
+            {"name": file.name, "size": file.stat().st_size, "md5": file_md5(file)}
+            for file in files
+        ],
+    }
+    with atomic_write(path) as tmp_path, tarfile.open(tmp_path, "w") as tar:
+        for file in files:
+            tar.add(file, arcname=file.name)
+        manifest_path = tmp_path.with_name(f"{tmp_path.name}.{BUNDLE_MANIFEST}")
+        try:
+            manifest_path.write_text(json.dumps(manifest, indent=2))
+            tar.add(manifest_path, arcname=BUNDLE_MANIFEST)
+        finally:
+            manifest_path.unlink()
+    return path
+
+
+def import_cache_bundle(
+    path: str | Path, *, cachedir: str | Path | None = None
+) -> list[Path]:
+    """Import a bundle of cached tables.
+
+    Checksums of the files are verified against the manifest of the bundle.
+    To share a cache between machines, import the bundle into a directory
+    that is set as `settings.shared_cachedir`.
+
+    Args:
+        path: Path of the bundle, see `export_cache_bundle()`.
+        cachedir: Directory to import the tables into, defaults to `settings.dynamicdir`.
+
+    Returns:
+        The paths of the imported files.
+
+    Example::
+
+        import bionty.base as bt_base
+
+        bt_base.import_cache_bundle("bionty-cache.tar", cachedir="/shared/bionty")
+        bt_base.settings.shared_cachedir = "/shared/bionty"
+    """
+    from .dev._io import file_md5
+
+    cachedir = Path(cachedir) if cachedir is not None else settings.dynamicdir
+    cachedir.mkdir(parents=True, exist_ok=True)
+    # the files are moved into cachedir once all of them are extracted and verified
+    tmpdir = Path(tempfile.mkdtemp(prefix=".bundle-", dir=cachedir))
+    try:
+        with tarfile.open(path) as tar:
+            manifest = json.load(tar.extractfile(BUNDLE_MANIFEST))  # type: ignore
+            if manifest["format_version"] > BUNDLE_FORMAT_VERSION:
+                raise ValueError(
+                    f"bundle format version {manifest['format_version']} is not supported, "
+                    "please upgrade bionty"
+                )
+            names = []
+            for entry in manifest["files"]:
+                name = entry["name"]
+                # only plain file names, nothing is written outside of cachedir
+                if Path(name).name != name:
+                    raise ValueError(f"invalid file name in bundle: {name}")
+                member = tar.getmember(name)
+                with tar.extractfile(member) as src, open(tmpdir / name, "wb") as dst:  # type: ignore
+                    shutil.copyfileobj(src, dst)
+                if file_md5(tmpdir / name) != entry["md5"]:
+                    raise ValueError(f"checksum mismatch of {name} in bundle {path}")
+                # the md5 sidecars are signed with the modification times
+                os.utime(tmpdir / name, (member.mtime, member.mtime))
+                names.append(name)
+        for name in names:
+            if name.endswith(".md5"):
+                _resign_md5_sidecar(tmpdir / name)
+        imported = []
+        for name in names:
+            if (tmpdir / name).exists():
+                (tmpdir / name).replace(cachedir / name)
+                imported.append(cachedir / name)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return imported
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import keyword
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from lamin_utils import logger
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+def lookup_keys(values: pd.Series, prefix: str = "bt") -> np.ndarray:
+    """Tab-completion keys of values as in `lamin_utils` lookups.
+
+    Returns:
+        An array aligned with `values`, `None` for non-string and empty values.
+    """
+    import numpy as np
+    import pandas as pd
+
+    values = pd.Series(values.to_numpy(dtype=object))
+    is_str = values.map(lambda value: isinstance(value, str) and value != "")
+    keys = (
+        values[is_str]
+        .astype(str)
+        .str.replace("[^0-9a-zA-Z_]+", "_", regex=True)
+        .str.lower()
+    )
+    keys = keys[keys != ""]
+    # keys must start with a letter
+    needs_prefix = ~keys.str[0].str.isalpha().astype(bool)
+    keys[needs_prefix] = f"{prefix.lower()}_" + keys[needs_prefix]
+    result = np.full(len(values), None, dtype=object)
+    result[keys.index.to_numpy()] = keys.to_numpy(dtype=object)
+    return result
+
+
+class _RecordDict(Mapping):
+    """{field value: record or records} of a lookup, records are created on access."""
+
+    def __init__(self, lookup: LazyLookup):
+        self._lookup = lookup
+
+    def __getitem__(self, value: str) -> tuple | list[tuple]:
+        positions = self._lookup._value_positions()[value]
+        if len(positions) == 1:
+            return self._lookup._record(positions[0])
+        return [self._lookup._record(position) for position in positions]
+
+    def __iter__(self):
+        return iter(self._lookup._value_positions())
+
+    def __len__(self) -> int:
+        return len(self._lookup._value_positions())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} values of {self._lookup!r})"
+
+
+class LazyLookup:
+    """Lookup object with dot and [] access that resolves records on demand.
+
+    Unlike the `NamedTuple` of `lamin_utils` lookups, no object is created per term when
+    the lookup is constructed. The keys of all terms are indexed on the first access,
+    records are only created for the accessed terms.
+
+    Args:
+        df: The table to look up records in.
+        field: The field whose values are the lookup keys.
+        tuple_name: The name of the record type.
+        prefix: Prefix of keys that don't start with a letter.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        field: str,
+        tuple_name: str = "MyTuple",
+        prefix: str = "bt",
+    ):
+        self._df = df
+        self._field = field
+        self._tuple_name = tuple_name
+        self._prefix = prefix
+        # {lookup key: row positions} and {field value: row positions}, built on first access
+        self._positions: dict[str, np.ndarray] | None = None
+        self._keys: list[str] | None = None
+        self._values: dict[str, np.ndarray] | None = None
+        # {row position: record} of the accessed records
+        self._records: dict[int, tuple] = {}
+        self._record_type: type | None = None
+        self._warned_keys: set[str] = set()
+
+    def _key_positions(self) -> dict[str, np.ndarray]:
+        import numpy as np
+        import pandas as pd
+
+        if self._positions is None:
+            keys = lookup_keys(self._df[self._field], self._prefix)
+            positions = np.flatnonzero(pd.notna(keys))
+            # keys in order of their first occurrence, as in `lamin_utils` lookups
+            groups = pd.Series(positions).groupby(keys[positions], sort=False).indices
+            self._positions = {key: positions[rows] for key, rows in groups.items()}
+            self._keys = list(self._positions)
+        return self._positions
+
+    def _value_positions(self) -> dict[str, np.ndarray]:
+        import numpy as np
+        import pandas as pd
+
+        if self._values is None:
+            values = self._df[self._field].to_numpy(dtype=object)
+            positions = np.flatnonzero(
+                [isinstance(value, str) and value != "" for value in values]
+            )
+            groups = pd.Series(positions).groupby(values[positions], sort=False).indices
+            self._values = {value: positions[rows] for value, rows in groups.items()}
+        return self._values
+
+    def _record(self, position: int) -> tuple:
+        from collections import namedtuple
+
+        record = self._records.get(position)
+        if record is None:
+            if self._record_type is None:
+                self._record_type = namedtuple(
+                    self._tuple_name, self._df.columns, rename=True
+                )
+            record = self._record_type(*self._df.iloc[position].tolist())
+            self._records[position] = record
+        return record
+
+    def _resolve(self, key: str) -> tuple:
+        positions = self._key_positions()[key]
+        if len(positions) > 1 and key not in self._warned_keys:
+            logger.warning(
+                f"{len(positions)} records found for '{key}'. Returning based on keep='first'."
+            )
+            self._warned_keys.add(key)
+        return self._record(positions[0])
+
+    def _attributes(self) -> list[str]:
+        # keywords are suffixed with an underscore
+        return [
+            f"{key}_" if keyword.iskeyword(key) else key
+            for key in self._key_positions()
+        ]
+
+    def __getattr__(self, name: str) -> Any:
+        # only called for names that aren't attributes of the object
+        if name.startswith("_"):
+            raise AttributeError(name)
+        key = name[:-1] if keyword.iskeyword(name[:-1]) else name
+        if key not in self._key_positions():
+            raise AttributeError(f"'Lookup' object has no attribute '{name}'")
+        return self._resolve(key)
+
+    def __dir__(self) -> list[str]:
+        return [*self._attributes(), "dict"]
+
+    def __iter__(self):
+        for key in self._key_positions():
+            yield self._resolve(key)
+        yield self.dict
+
+    def __len__(self) -> int:
+        return len(self._key_positions()) + 1
+
+    def __getitem__(self, item: int | slice | str) -> Any:
+        """Access records by position like a `NamedTuple`, or by a value of the field like `dict()`."""
+        if isinstance(item, str):
+            return self.dict()[item]
+        if isinstance(item, slice):
+            return tuple(self._item(index) for index in range(len(self))[item])
+        return self._item(range(len(self))[item])
+
+    def _item(self, index: int) -> Any:
+        # the records of the keys are followed by the `dict` method
+        self._key_positions()
+        if index == len(self._keys):  # type:ignore
+            return self.dict
+        return self._resolve(self._keys[index])  # type:ignore
+
+    def __repr__(self) -> str:
+        return f"Lookup({self._tuple_name}, field={self._field!r})"
+
+    def dict(self) -> Mapping[str, tuple | list[tuple]]:
+        """Dictionary of the lookup, {field value: record or records}.
+
+        The values are indexed once, records are created on access.
+        """
+        return _RecordDict(self)
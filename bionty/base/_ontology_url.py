@@ -1,6 +1,16 @@
-from functools import lru_cache
+from __future__ import annotations
 
-import requests
+import json
+import time
+from typing import TYPE_CHECKING
+
+from ._settings import settings
+from .dev._io import atomic_write, file_lock, http_session
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import requests
 
 
 def import_bioregistry():
@@ -33,10 +43,55 @@ class OntologyVersionNotFoundError(OntologyURLError):
     pass
 
 
-@lru_cache(maxsize=128)
+# errors that are cached as negative resolutions
+_CACHED_ERRORS = {
+    error.__name__: error
+    for error in (OntologyNotFoundError, OntologyVersionNotFoundError)
+}
+
+# {"{prefix}|{version}": resolution} of the resolutions read or made by this process
+_resolutions: dict[str, dict] = {}
+
+
+def _resolutions_path() -> Path:
+    return settings.dynamicdir / "ontology_urls.json"
+
+
+def _read_resolutions() -> dict[str, dict]:
+    try:
+        return json.loads(_resolutions_path().read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_resolution(key: str, resolution: dict) -> None:
+    _resolutions[key] = resolution
+    path = _resolutions_path()
+    try:
+        with file_lock(path):
+            resolutions = _read_resolutions()
+            resolutions[key] = resolution
+            with atomic_write(path) as tmp_path:
+                tmp_path.write_text(json.dumps(resolutions))
+    except OSError:
+        # the cache is optional, e.g. for read-only installations
+        pass
+
+
+def _is_valid(resolution: dict, version: str | None) -> bool:
+    """Resolutions of the latest version and failed resolutions expire after `settings.assets_ttl`."""
+    if settings.offline or (version is not None and "error" not in resolution):
+        return True
+    return time.time() - resolution["checked"] < settings.assets_ttl
+
+
 def get_ontology_url(prefix: str, version: str | None = None) -> tuple[str, str]:
     """Get a versioned download URL for an ontology based on its CURIE prefix.
 
+    Resolutions are cached in the dynamic directory, including the ones that
+    failed because the ontology or version doesn't exist.
+    In offline mode, only cached resolutions are used.
+
     Args:
         prefix: The CURIE prefix (e.g., 'GO', 'MONDO', 'HP')
         version: Optional version string (e.g., '2023-01-01')
@@ -48,68 +103,163 @@ def get_ontology_url(prefix: str, version: str | None = None) -> tuple[str, str]
     Raises:
         OntologyNotFoundError: If the ontology cannot be found
         OntologyVersionNotFoundError: If no versioned URL can be found
+        OntologyURLError: If the ontology isn't resolved yet and bionty is offline
+        requests.RequestException: If a registry can't be reached, this isn't cached
     """
-    bioregistry = import_bioregistry()
-
     if not prefix:
         raise ValueError("please provide a prefix")
 
+    key = f"{prefix.lower()}|{version or ''}"
+    resolution = _resolutions.get(key) or _read_resolutions().get(key)
+    if resolution is not None and _is_valid(resolution, version):
+        _resolutions[key] = resolution
+        if "error" in resolution:
+            raise _CACHED_ERRORS[resolution["error"]](resolution["message"])
+        return resolution["url"], resolution["version"]
+
+    if settings.offline:
+        raise OntologyURLError(
+            f"cannot resolve ontology '{prefix}', bionty is in offline mode (settings.offline)"
+        )
+
+    try:
+        url, ver = _resolve_ontology_url(prefix, version)
+    except tuple(_CACHED_ERRORS.values()) as e:
+        _write_resolution(
+            key, {"error": type(e).__name__, "message": str(e), "checked": time.time()}
+        )
+        raise
+    _write_resolution(key, {"url": url, "version": ver, "checked": time.time()})
+    return url, ver
+
+
+def _resolve_ontology_url(prefix: str, version: str | None) -> tuple[str, str]:
+    """Resolve the download URL via bioregistry and OLS4.
+
+    The prefix is checked concurrently with the lookup of the URL.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    import requests  # type:ignore
+
+    bioregistry = import_bioregistry()
+
     # Normalize the prefix
     normalized = bioregistry.normalize_prefix(prefix) or prefix
 
-    # Check if the prefix exists at all
-    if not _prefix_exists(normalized):
-        raise OntologyNotFoundError(f"ontology with prefix '{prefix}' not found")
-
-    # If specific version requested, try to get it
-    if version:
-        # try standard versioned URL patterns
-        url, ver = _get_specific_version(normalized, version)
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        prefix_exists = executor.submit(_prefix_exists, normalized)
+        error = None
+        try:
+            if version:
+                # try standard versioned URL patterns
+                url, ver = _get_specific_version(normalized, version)
+            else:
+                url, ver = _get_latest_from_ols4(normalized)
+        except requests.RequestException as e:
+            url, ver, error = None, None, e
         if url:
             return url, ver
 
+        # Check if the prefix exists at all
+        if not prefix_exists.result():
+            raise OntologyNotFoundError(f"ontology with prefix '{prefix}' not found")
+    finally:
+        executor.shutdown(wait=False)
+    if error is not None:
+        raise error
+
+    if version:
         raise OntologyVersionNotFoundError(
             f"version '{version}' of ontology '{prefix}' not found"
         )
-
-    # For latest version
-    url, ver = _get_latest_from_ols4(normalized)
-    if url:
-        return url, ver
-
     # If we get here, no versioned URL was found
     raise OntologyVersionNotFoundError(
         f"no versioned URL found for ontology '{prefix}'"
     )
 
 
+# responses that definitely mean a resource doesn't exist, only these are cached
+_NOT_FOUND_STATUS_CODES = frozenset({404, 410})
+
+
+def _exists(response: requests.Response) -> bool:
+    """Whether the resource of a response exists.
+
+    Raises:
+        requests.HTTPError: If the response is neither a success nor a not-found.
+    """
+    if response.status_code < 400:
+        return True
+    if response.status_code in _NOT_FOUND_STATUS_CODES:
+        return False
+    response.raise_for_status()
+    return False
+
+
 def _prefix_exists(prefix: str) -> bool:
-    """Check if a prefix exists in any registry."""
+    """Check if a prefix exists in any registry.
+
+    Raises:
+        requests.RequestException: If OLS4 can't be reached or doesn't answer.
+    """
     bioregistry = import_bioregistry()
 
     if bioregistry.normalize_prefix(prefix):
         return True
 
     # Check OLS4
-    try:
-        response = requests.head(
-            f"https://www.ebi.ac.uk/ols4/api/ontologies/{prefix.lower()}", timeout=5
-        )
-        if response.status_code < 400:
-            return True
-    except requests.RequestException:
-        pass
-
-    return False
+    response = http_session(retry=False).head(
+        f"https://www.ebi.ac.uk/ols4/api/ontologies/{prefix.lower()}", timeout=5
+    )
+    return _exists(response)
 
 
 def _url_exists(url: str) -> bool:
-    """Check if a URL exists and returns a valid response."""
+    """Check if a URL exists and returns a valid response.
+
+    Raises:
+        requests.RequestException: If the URL can't be reached or doesn't answer.
+    """
+    response = http_session(retry=False).head(url, timeout=5, allow_redirects=True)
+    return _exists(response)
+
+
+def _first_existing_url(urls: list[str]) -> str | None:
+    """Probe all URLs at once and return the first existing one in the order of `urls`.
+
+    Returns as soon as a URL exists and the URLs before it don't exist or couldn't
+    be probed, the probes of the URLs after it are cancelled.
+
+    Raises:
+        requests.RequestException: If no URL exists and a probe failed.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    import requests  # type:ignore
+
+    if not urls:
+        return None
+    executor = ThreadPoolExecutor(max_workers=len(urls))
+    futures = [executor.submit(_url_exists, url) for url in urls]
+    error = None
     try:
-        response = requests.head(url, timeout=5, allow_redirects=True)
-        return response.status_code >= 200 and response.status_code < 400
-    except requests.RequestException:
-        return False
+        for url, future in zip(urls, futures, strict=True):
+            try:
+                if future.result():
+                    return url
+            except requests.RequestException as e:
+                # it's unknown whether the url exists, the next ones are tried
+                error = error or e
+    finally:
+        for future in futures:
+            future.cancel()
+        # running probes are finished in the background
+        executor.shutdown(wait=False)
+    if error is not None:
+        raise error
+    return None
 
 
 def _extract_version_from_iri(version_iri: str | None):
@@ -122,7 +272,11 @@ def _extract_version_from_iri(version_iri: str | None):
 
 
 def _get_specific_version(prefix: str, version: str) -> tuple[str | None, str | None]:
-    """Get URL for a specific version of an ontology using standard patterns."""
+    """Get URL for a specific version of an ontology using standard patterns.
+
+    Raises:
+        requests.RequestException: If no pattern exists and a URL couldn't be probed.
+    """
     bioregistry = import_bioregistry()
 
     # Clean version string
@@ -139,47 +293,48 @@ def _get_specific_version(prefix: str, version: str) -> tuple[str | None, str |
         f"http://purl.obolibrary.org/obo/{obo_prefix.lower()}/v{clean_version}/{obo_prefix.lower()}.owl",
     ]
 
-    for url in standard_patterns:
-        if _url_exists(url):
-            return url, clean_version
+    url = _first_existing_url(standard_patterns)
+    if url is not None:
+        return url, clean_version
 
     return None, None
 
 
 def _get_latest_from_ols4(prefix: str) -> tuple[str | None, str | None]:
-    """Get the latest version information from OLS4."""
-    try:
-        response = requests.get(
-            f"https://www.ebi.ac.uk/ols4/api/ontologies/{prefix.lower()}", timeout=30
-        )
-        if response.status_code != 200:
-            return None, None
-
-        data = response.json()
-        config = data.get("config", {})
-
-        # Get version information
-        version = config.get("version")
-
-        # Check versionIri first (preferred source)
-        version_iri = config.get("versionIri")
-        if version_iri and _url_exists(version_iri):
-            # If we have a versionIri and it exists, use it
-            # Extract version from IRI if not already provided
-            if not version:
-                version = _extract_version_from_iri(version_iri)
-            return version_iri, version
-
-        # Fall back to fileLocation if available
-        file_location = config.get("fileLocation")
-        if file_location and _url_exists(file_location):
-            if not version and version_iri:
-                # even when version_iri is not accessible, we can still extract the version, for example: pw
-                version = _extract_version_from_iri(version_iri)
-            return file_location, version
-
-        # No valid URLs found
-        return None, None
+    """Get the latest version information from OLS4.
 
-    except requests.RequestException:
+    Raises:
+        requests.RequestException: If OLS4 or the ontology urls can't be reached.
+    """
+    response = http_session().get(
+        f"https://www.ebi.ac.uk/ols4/api/ontologies/{prefix.lower()}", timeout=30
+    )
+    if not _exists(response):
         return None, None
+
+    data = response.json()
+    config = data.get("config", {})
+
+    # Get version information
+    version = config.get("version")
+
+    # Check versionIri first (preferred source), fileLocation is probed concurrently
+    version_iri = config.get("versionIri")
+    file_location = config.get("fileLocation")
+    url = _first_existing_url([u for u in (version_iri, file_location) if u])
+    if url is not None and url == version_iri:
+        # If we have a versionIri and it exists, use it
+        # Extract version from IRI if not already provided
+        if not version:
+            version = _extract_version_from_iri(version_iri)
+        return version_iri, version
+
+    # Fall back to fileLocation if available
+    if url is not None and url == file_location:
+        if not version and version_iri:
+            # even when version_iri is not accessible, we can still extract the version, for example: pw
+            version = _extract_version_from_iri(version_iri)
+        return file_location, version
+
+    # No valid URLs found
+    return None, None
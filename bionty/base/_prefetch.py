@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from lamin_utils import logger
+
+from ._settings import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from pandas import DataFrame
+
+
+# settings that are passed to the worker processes
+_WORKER_SETTINGS = (
+    "datasetdir",
+    "dynamicdir",
+    "offline",
+    "assets_freshness",
+    "assets_ttl",
+    "shared_cachedir",
+)
+
+
+def _prefetch_source(source: dict, settings_values: dict | None = None) -> dict:
+    """Download or convert the table of a source into the cache."""
+    import bionty.base as bt_base
+
+    from .dev._io import cached_md5
+
+    for name, value in (settings_values or {}).items():
+        setattr(settings, name, value)
+
+    entity = source["entity"].split(".")[-1]
+    record = {
+        "entity": entity,
+        "organism": source["organism"],
+        "name": source["name"],
+        "version": source["version"],
+        "path": None,
+        "size": None,
+        "md5": None,
+        "error": None,
+    }
+    try:
+        # the organism of Organism sources is the taxa
+        organism_kwarg = "taxa" if entity == "Organism" else "organism"
+        public_ontology = getattr(bt_base, entity)(
+            source=source["name"],
+            version=source["version"],
+            **{organism_kwarg: source["organism"]},
+        )
+        if public_ontology._df.empty:
+            raise ValueError("the table of the source is empty")
+        path = public_ontology._cached_parquet_path()
+        record["path"] = path.as_posix()
+        record["size"] = path.stat().st_size
+        record["md5"] = cached_md5(path)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def prefetch_sources(
+    sources: DataFrame | Iterable[dict] | None = None,
+    *,
+    n_workers: int = 4,
+    manifest: str | Path | None = None,
+) -> DataFrame:
+    """Download and convert the tables of sources into the local cache.
+
+    Sources are prefetched concurrently in worker processes, so that the cache
+    of a machine can be warmed before jobs start.
+
+    Args:
+        sources: Sources with `entity`, `organism`, `name` and `version`,
+            e.g. `bt.Source.filter(currently_used=True).to_dataframe()`.
+            Defaults to the currently used sources of `sources.yaml`.
+        n_workers: Number of worker processes that prefetch sources at the same time.
+        manifest: Path to write the returned manifest to as json.
+
+    Returns:
+        A manifest with the path, size and md5 checksum of the cached table of
+        each source, or the error if the source couldn't be prefetched.
+
+    Example::
+
+        import bionty.base as bt_base
+
+        bt_base.prefetch_sources(manifest="manifest.json")
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    import pandas as pd
+
+    from .dev._handle_sources import currently_used_rows
+
+    if sources is None:
+        sources = currently_used_rows(settings.public_sources)
+    elif isinstance(sources, pd.DataFrame):
+        sources = sources.to_dict(orient="records")
+    sources = list(sources)
+
+    if not sources:
+        records = []
+    else:
+        # parsing ontologies is CPU-bound, spawned processes don't inherit
+        # the locks and connections of this process
+        with ProcessPoolExecutor(
+            max_workers=min(n_workers, len(sources)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            settings_values = {
+                name: getattr(settings, name) for name in _WORKER_SETTINGS
+            }
+            records = list(
+                executor.map(
+                    partial(_prefetch_source, settings_values=settings_values),
+                    sources,
+                )
+            )
+
+    for record in records:
+        if record["error"] is not None:
+            logger.warning(
+                f"failed to prefetch {record['entity']} source {record['name']}, "
+                f"{record['version']}: {record['error']}"
+            )
+    if manifest is not None:
+        from .dev._io import atomic_write
+
+        with atomic_write(manifest) as tmp_path:
+            tmp_path.write_text(json.dumps(records, indent=2))
+
+    return pd.DataFrame(records)
@@ -2,26 +2,70 @@ from __future__ import annotations
 
 import importlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Literal
 
-import numpy as np
 from lamin_utils import logger
-from lamin_utils._lookup import Lookup
 from lamindb_setup.core import deprecated
 
 from ._settings import check_datasetdir_exists, check_dynamicdir_exists, settings
 from .dev._handle_sources import LAMINDB_INSTANCE_LOADED
-from .dev._io import s3_bionty_assets, url_download
+from .dev._io import (
+    _lock_path,
+    _s3_root,
+    atomic_write,
+    cached_stat,
+    file_lock,
+    gzip_compress,
+    is_gzipped,
+    remove_cached_file,
+    s3_bionty_assets,
+    shared_cache_path,
+    url_download,
+    verify_md5,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
     from pathlib import Path
 
+    import numpy as np
     import pandas as pd
 
+    from bionty.base._lookup import LazyLookup
     from bionty.base._ontology import Ontology
 
+    from ._search_index import SearchIndex
     from .dev import InspectResult
+    from .dev._handle_sources import SourceRegistry
+
+# number of tables kept in memory by read_table
+TABLE_CACHE_SIZE = 8
+
+# {(path, size, modification time): table} of the tables read by this process
+_tables: OrderedDict[tuple[str, int, int], pd.DataFrame] = OrderedDict()
+_tables_lock = threading.Lock()
+
+
+def read_table(path: Path) -> pd.DataFrame:
+    """Read a cached parquet file, the table is shared in the process while the file is unchanged."""
+    import pandas as pd
+
+    stat = path.stat()
+    key = (path.as_posix(), stat.st_size, stat.st_mtime_ns)
+    with _tables_lock:
+        df = _tables.get(key)
+        if df is not None:
+            _tables.move_to_end(key)
+    if df is None:
+        df = pd.read_parquet(path)
+        with _tables_lock:
+            _tables[key] = df
+            while len(_tables) > TABLE_CACHE_SIZE:
+                _tables.popitem(last=False)
+    # assigning columns of a shallow copy doesn't change the shared table
+    return df.copy(deep=False)
 
 
 def encode_filenames(
@@ -52,14 +96,24 @@ class PublicOntology:
         entity: str | None = None,
         ols_supported: bool = True,
         filter_prefix: bool = True,
+        md5: str | None = None,
     ):
         self._entity = entity or self.__class__.__name__
+        # md5 checksum of the parquet file, e.g. from `Source.md5`
+        self._md5 = md5
+        # the table is read into memory on first access of `_df`
+        self._loaded_df: pd.DataFrame | None = None
+        # column names read from the parquet schema at the source
+        self._source_columns: list[str] | None = None
+        # built on the first search
+        self._search_index: SearchIndex | None = None
         self._ols_supported = ols_supported
         self._filter_prefix = filter_prefix
         self.include_id_prefixes = include_id_prefixes
         self.include_rel = include_rel
 
         # search in all available sources to get url
+        match_error = None
         try:
             self._fetch_sources()
             self._source_dict = self._match_sources(
@@ -73,7 +127,7 @@ class PublicOntology:
             if LAMINDB_INSTANCE_LOADED:
                 # to support StaticSource in lamindb
                 self._source_dict = {}
-                pass
+                match_error = e
             else:
                 raise e
 
@@ -83,21 +137,98 @@ class PublicOntology:
 
         self._get_url()
         self._set_file_paths()
+        # the table is loaded lazily, fail here if it can't be loaded at all
+        if not self._is_available():
+            raise match_error or ValueError(
+                f"No source url of {self._entity} is available for source {self.source}, version {self.version}."
+            )
 
-        # df is only read into memory at the init to improve performance
-        df = self._load_df()
-        # self._df has no index
-        if not df.empty and df.index.name is not None:
-            df = df.reset_index()
-        self._df: pd.DataFrame = df
-
-        # set column names/fields as attributes
-        for col_name in self._df.columns:
-            try:
-                setattr(self, col_name, PublicOntologyField(self, col_name))
-            # Some fields of an ontology (e.g. Gene) are not PublicOntology class attributes and must be skipped.
-            except AttributeError:
-                pass
+    def __getattr__(self, name: str) -> PublicOntologyField:
+        # only called if the attribute isn't found otherwise
+        # column names/fields are resolved against the schema of the table
+        if not name.startswith("_") and name in self._columns():
+            field = PublicOntologyField(self, name)
+            setattr(self, name, field)
+            return field
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    @property
+    def _df(self) -> pd.DataFrame:
+        """The table of the ontology, read into memory on first access."""
+        if self._loaded_df is None:
+            parquet_path = self._cached_parquet_path()
+            if parquet_path != self._local_parquet_path and (
+                self._md5 is None or verify_md5(parquet_path, self._md5)
+            ):
+                # files in the read-only shared cache are never updated
+                df = read_table(parquet_path)
+            else:
+                df = self._load_df()
+            # self._df has no index
+            if not df.empty and df.index.name is not None:
+                df = df.reset_index()
+            self._loaded_df = df
+        return self._loaded_df
+
+    def _columns(self) -> list[str]:
+        """Column names of the table, read from its parquet schema if it's not loaded.
+
+        Before the table is cached, the schema is read from the footer of the
+        parquet file at the source, the table is only loaded if that's not possible.
+        """
+        import pyarrow.parquet as pq
+
+        if self._loaded_df is None:
+            parquet_path = self._cached_parquet_path()
+            if parquet_path.exists():
+                return pq.read_schema(parquet_path).names
+            if self._source_columns is None:
+                self._source_columns = self._read_source_columns()
+            if self._source_columns is not None:
+                return self._source_columns
+        return self._df.columns.tolist()
+
+    def _read_source_columns(self) -> list[str] | None:
+        """Column names from the schema of the parquet file at the source, without downloading it."""
+        import pyarrow.parquet as pq
+
+        if self._parquet_filename is not None:
+            if settings.offline:
+                return None
+            source_path = _s3_root("s3://bionty-assets") / self._parquet_filename
+        elif self._url.startswith("file://") or (
+            self._url.endswith(".parquet") and not settings.offline
+        ):
+            from lamindb_setup.core.upath import UPath
+
+            source_path = UPath(self._url)
+        else:
+            return None
+        try:
+            with source_path.open("rb") as file:
+                return pq.read_schema(file).names
+        except Exception as e:
+            # the table is loaded to get its columns, e.g. if it's converted from an ontology
+            logger.debug(f"couldn't read the schema of {source_path}: {e}")
+            return None
+
+    def _is_available(self) -> bool:
+        """Whether the table can be loaded from the source url or cached files."""
+        return (
+            bool(self._url)
+            or self._cached_parquet_path().exists()
+            or (
+                self._local_ontology_path is not None
+                and self._local_ontology_path.exists()
+            )
+        )
+
+    def _cached_parquet_path(self) -> Path:
+        """The parquet file in `settings.shared_cachedir` if available, otherwise in `dynamicdir`."""
+        shared_path = shared_cache_path(self._local_parquet_path.name)
+        return shared_path if shared_path is not None else self._local_parquet_path
 
     def __repr__(self) -> str:
         # fmt: off
@@ -106,7 +237,7 @@ class PublicOntology:
             f"Entity: {self._entity}\n"
             f"Organism: {self.organism}\n"
             f"Source: {self.source}, {self.version}\n"
-            f"#terms: {self._df.shape[0] if hasattr(self, '_df') else ''}\n\n"
+            f"#terms: {self._loaded_df.shape[0] if self._loaded_df is not None else ''}\n\n"
         )
         # fmt: on
         return representation
@@ -135,6 +266,12 @@ class PublicOntology:
             for field in vars(self)
             if not callable(getattr(self, field)) and not field.startswith("_")
         }
+        # Some fields of an ontology (e.g. Gene) are not PublicOntology class attributes and must be skipped.
+        fields.update(
+            col
+            for col in self._columns()
+            if not col.startswith("_") and not hasattr(type(self), col)
+        )
         return fields - blacklist
 
     def _download_ontology_file(self, localpath: Path, url: str) -> None:
@@ -148,13 +285,13 @@ class PublicOntology:
             self._url_download(url, localpath)
 
     def _fetch_sources(self) -> None:
-        from .dev._handle_sources import parse_sources_yaml
+        from .dev._handle_sources import load_source_registry
 
-        self._all_sources = parse_sources_yaml(url_pattern=True)
+        self._all_sources = load_source_registry()
 
     def _match_sources(
         self,
-        ref_sources: pd.DataFrame,
+        ref_sources: SourceRegistry,
         name: str | None = None,
         version: str | None = None,
         organism: str | None = None,
@@ -167,29 +304,21 @@ class PublicOntology:
         if name is not None:
             conditions["name"] = name
 
-        # If no parameters provided, use the first source
-        if not conditions:
-            rows = ref_sources
-        else:
-            # Filter dataframe using all conditions
-            query = True
-            for col, value in conditions.items():
-                query = query & (ref_sources[col] == value)
-            rows = ref_sources[query]
+        # If no parameters provided, all sources match
+        rows = ref_sources.match(name=name, organism=conditions.get("organism"))
 
         # For ensembl, need to filter by entity
-        if not rows.empty and rows.head(1)["name"].values[0] == "ensembl":
-            rows = rows[rows["entity"] == self._entity.split(".")[-1]]
-
-        row = rows.head(1)
+        if rows and rows[0]["name"] == "ensembl":
+            entity = self._entity.split(".")[-1]
+            rows = [row for row in rows if row["entity"] == entity]
 
         # If no records matched
-        if row.empty:
+        if not rows:
             url = None
             ontology_version = None
             if self._ols_supported:
                 # try to get the ontology url
-                if name and name not in ref_sources["name"].values:
+                if name and not ref_sources.has_name(name):
                     from ._ontology_url import get_ontology_url
 
                     try:
@@ -215,7 +344,7 @@ class PublicOntology:
                 )
 
         # Build result and replace version placeholder in URL
-        meta_dict = row.iloc[0].to_dict()
+        meta_dict = dict(rows[0])
         ver = version or meta_dict.get("version")
         meta_dict["version"] = ver
         meta_dict["url"] = meta_dict["url"].replace("{version}", ver)
@@ -223,19 +352,48 @@ class PublicOntology:
         return meta_dict
 
     @check_dynamicdir_exists
-    def _url_download(self, url: str, localpath: Path) -> None:
-        """Download file from url to dynamicdir _local_ontology_path."""
-        # Try to download from s3://bionty-assets
-        s3_bionty_assets(
-            filename=self._ontology_filename,  # type: ignore
-            assets_base_url="s3://bionty-assets",
-            localpath=localpath,
-        )
+    def _url_download(self, url: str, localpath: Path, md5: str | None = None) -> None:
+        """Download file from url to dynamicdir _local_ontology_path.
 
-        # If the file is not available, download from the url
-        if not localpath.exists():
-            logger.info(f"downloading {self._entity} source file from: {url}")
-            _ = url_download(url, localpath)
+        Args:
+            url: The url of the file.
+            localpath: The path to download the file to.
+            md5: Expected hex md5 checksum of the file, verified while downloading.
+        """
+        with file_lock(localpath):
+            # another process might have downloaded the file while we waited
+            if localpath.exists():
+                return
+            # Try to download from s3://bionty-assets
+            if is_gzipped(localpath) and self._ontology_filename is not None:
+                s3_bionty_assets(
+                    filename=f"{self._ontology_filename}.gz",
+                    assets_base_url="s3://bionty-assets",
+                    localpath=localpath,
+                )
+                if not localpath.exists():
+                    # compress the uncompressed asset into the cache
+                    s3_path = s3_bionty_assets(
+                        filename=self._ontology_filename,
+                        assets_base_url="s3://bionty-assets",
+                        localpath=settings.dynamicdir / self._ontology_filename,
+                    )
+                    if s3_path.exists():
+                        with atomic_write(localpath) as tmp_path:
+                            gzip_compress(s3_path, tmp_path)
+                        s3_path.unlink()
+            else:
+                s3_bionty_assets(
+                    filename=self._ontology_filename,  # type: ignore
+                    assets_base_url="s3://bionty-assets",
+                    localpath=localpath,
+                    md5=md5,
+                )
+
+            # If the file is not available, download from the url
+            if not localpath.exists():
+                logger.info(f"downloading {self._entity} source file from: {url}")
+                _ = url_download(url, localpath, md5=md5)
 
     def _get_url(self):
         """Get the url of the source."""
@@ -262,6 +420,14 @@ class PublicOntology:
                 self._parquet_filename = None  # type:ignore
         else:
             self._local_ontology_path = settings.dynamicdir / self._ontology_filename
+            # ontology source files are cached gzip-compressed and decompressed
+            # while parsing, uncompressed files cached earlier are still used
+            if not self._local_ontology_path.exists():
+                self._local_ontology_path = (
+                    shared_cache_path(f"{self._ontology_filename}.gz")
+                    or shared_cache_path(self._ontology_filename)
+                    or settings.dynamicdir / f"{self._ontology_filename}.gz"
+                )
 
         # ontology source not present in the sources.yaml file
         # these entities don't have ontology files
@@ -285,16 +451,40 @@ class PublicOntology:
     def _load_df(self) -> pd.DataFrame:
         import pandas as pd
 
+        # only one process downloads or converts the parquet file
+        with file_lock(self._local_parquet_path):
+            parquet_path = self._local_parquet_path
+            if (
+                self._md5 is not None
+                and parquet_path.exists()
+                and not verify_md5(parquet_path, self._md5)
+            ):
+                logger.warning(
+                    f"cached {parquet_path.name} doesn't match the md5 checksum of the source, fetching it again..."
+                )
+                remove_cached_file(parquet_path)
+            # downloads are verified against the md5 checksum
+            self._fetch_parquet()
+
+        if self._local_parquet_path.exists():
+            # Loading the parquet file resets the index
+            return read_table(self._local_parquet_path)
+        return pd.DataFrame()
+
+    def _fetch_parquet(self) -> None:
+        """Download the parquet file or convert the ontology into it if not cached."""
         if self._parquet_filename is None:
-            self._url_download(self._url, self._local_parquet_path)
+            self._url_download(self._url, self._local_parquet_path, md5=self._md5)
         else:
             s3_bionty_assets(
                 filename=self._parquet_filename,
                 assets_base_url="s3://bionty-assets",
                 localpath=self._local_parquet_path,
+                md5=self._md5,
             )
         # If download is not possible, write a parquet file of the ontology df
-        if not self._url.endswith(".parquet"):
+        # a table with a known md5 checksum is only downloaded
+        if not self._url.endswith(".parquet") and self._md5 is None:
             if not self._local_parquet_path.exists():
                 pronto = self.to_pronto(mute=True)
                 if pronto is not None:
@@ -303,23 +493,26 @@ class PublicOntology:
                         include_id_prefixes=self.include_id_prefixes,
                         include_rel=self.include_rel,
                     )
-                    df.to_parquet(self._local_parquet_path)
-
-        if self._local_parquet_path.exists():
-            # Loading the parquet file resets the index
-            return pd.read_parquet(self._local_parquet_path)
-        return pd.DataFrame()
+                    with atomic_write(self._local_parquet_path) as tmp_path:
+                        df.to_parquet(tmp_path)
 
     def clear_cache(self) -> None:
-        """Clear cached ontology files."""
+        """Clear cached ontology files with their sidecar files and locks."""
         import bionty.base as bt_base
 
-        if self._local_parquet_path.exists():
-            self._local_parquet_path.unlink()
-            logger.success(f"deleted cached parquet file: {self._local_parquet_path}")
-        if self._local_ontology_path and self._local_ontology_path.exists():
-            self._local_ontology_path.unlink()
-            logger.success(f"deleted cached ontology file: {self._local_ontology_path}")
+        for path, kind in (
+            (self._local_parquet_path, "parquet"),
+            (self._local_ontology_path, "ontology"),
+        ):
+            # files in the read-only shared cache are kept
+            if path is None or path.parent != settings.dynamicdir:
+                continue
+            with file_lock(path):
+                existed = path.exists()
+                remove_cached_file(path)
+            _lock_path(path).unlink(missing_ok=True)
+            if existed:
+                logger.success(f"deleted cached {kind} file: {path}")
         importlib.reload(bt_base)
 
     def to_pronto(self, mute: bool = False) -> Ontology:  # type:ignore
@@ -370,6 +563,29 @@ class PublicOntology:
         else:
             return self._df
 
+    def _n_terms(self, *, exclude_obsolete: bool = False) -> int:
+        """Number of terms in `to_dataframe()`, cached alongside the table while it's unchanged.
+
+        Args:
+            exclude_obsolete: Whether to exclude terms whose name starts with "obsolete".
+        """
+
+        def count() -> int:
+            df = self.to_dataframe()
+            if exclude_obsolete and "name" in df.columns:
+                df = df[~df["name"].fillna("").str.startswith("obsolete")]
+            return df.shape[0]
+
+        parquet_path = self._cached_parquet_path()
+        if not parquet_path.exists():
+            return count()
+        key = "n_terms"
+        if self._filter_prefix:
+            key += f"_{self._source}"
+        if exclude_obsolete:
+            key += "_without_obsolete"
+        return cached_stat(parquet_path, key, count)
+
     @deprecated("to_dataframe")
     def df(self) -> pd.DataFrame:
         return self.to_dataframe()
@@ -532,15 +748,17 @@ class PublicOntology:
             synonyms_field=str(synonyms_field),
         )
 
-    def lookup(self, field: PublicOntologyField | str | None = None) -> tuple:
+    def lookup(self, field: PublicOntologyField | str | None = None) -> LazyLookup:
         """An auto-complete object for a PublicOntology field.
 
+        Records are only created for the accessed values, the lookup is cheap to create.
+
         Args:
             field: The field to lookup the values for.
                 Defaults to 'name'.
 
         Returns:
-            A NamedTuple of lookup information of the field values.
+            A lookup object with dot access to records of the field values.
 
         Example::
 
@@ -551,12 +769,14 @@ class PublicOntology:
             lookup_dict = lookup.dict()
             lookup['CD103-positive dendritic cell']
         """
-        return Lookup(
+        from ._lookup import LazyLookup
+
+        return LazyLookup(
             df=self._df,
             field=self._get_default_field(field),
             tuple_name=self._entity,
             prefix="bt",
-        ).lookup()
+        )
 
     def search(
         self,
@@ -585,17 +805,14 @@ class PublicOntology:
             public = bt_base.CellType()
             public.search("gamma delta T cell")
         """
-        from lamin_utils._search import search
-
-        if isinstance(field, PublicOntologyField):
-            field = field.name
-        elif field is not None and not isinstance(field, str):
-            field = [f.name if isinstance(f, PublicOntologyField) else f for f in field]
-
-        result = search(
-            df=self._df,
-            string=string,
-            field=field,
+        from ._search_index import search_candidates
+
+        # only rows containing the string are ranked
+        result = search_candidates(
+            self._df,
+            self._get_search_index(),
+            string,
+            field=self._search_field_names(field),
             limit=limit,
             case_sensitive=case_sensitive,
         )
@@ -603,6 +820,66 @@ class PublicOntology:
             result = result.set_index("ontology_id")
         return result
 
+    def search_many(
+        self,
+        strings: Iterable[str],
+        *,
+        field: PublicOntologyField | str | list[PublicOntologyField | str] = None,
+        limit: int | None = None,
+        case_sensitive: bool = False,
+        n_workers: int = 1,
+    ) -> pd.DataFrame:
+        """Search many strings at once against a PublicOntology field or fields.
+
+        The search index is shared by all queries, duplicate strings are searched once.
+
+        Args:
+            strings: The input strings to match against the field values.
+            field: The PublicOntologyField or several fields of the ontology
+                the input strings are matching against. Search all fields containing strings by default.
+            limit: Maximum amount of top results to return per string. If None, return all results.
+            case_sensitive: Whether the match is case sensitive.
+            n_workers: Number of processes to search in.
+
+        Returns:
+            A DataFrame with a row per hit and columns `query`, `ontology_id`, `score` and `rank`,
+            `rank` is the 1-based position of the hit in the results of its query.
+
+        Example::
+
+            import bionty.base as bt_base
+
+            public = bt_base.CellType()
+            public.search_many(["T cell", "B cell"], limit=5)
+        """
+        from ._search_index import search_many
+
+        return search_many(
+            self._df,
+            strings,
+            index=self._get_search_index(),
+            n_workers=n_workers,
+            field=self._search_field_names(field),
+            limit=limit,
+            case_sensitive=case_sensitive,
+        )
+
+    def _search_field_names(
+        self, field: PublicOntologyField | str | list[PublicOntologyField | str] | None
+    ) -> str | list[str] | None:
+        if isinstance(field, PublicOntologyField):
+            return field.name
+        if field is not None and not isinstance(field, str):
+            return [f.name if isinstance(f, PublicOntologyField) else f for f in field]
+        return field
+
+    def _get_search_index(self) -> SearchIndex:
+        from ._search_index import SearchIndex
+
+        if self._search_index is None:
+            self._search_index = SearchIndex(self._df)
+        return self._search_index
+
     def diff(
         self, compare_to: PublicOntology, **kwargs
     ) -> tuple[pd.DataFrame, pd.DataFrame]:
@@ -636,6 +913,8 @@ class PublicOntology:
         if self.version == compare_to.version:
             raise ValueError("The versions of the PublicOntology objects must differ.")
 
+        import numpy as np
+
         # The 'parents' column (among potentially others) contain Numpy array values.
         # We transform them to tuples to determine the diff.
         def _convert_arrays_to_tuples(arr):  # pragma: no cover
@@ -652,6 +931,7 @@ class PublicOntology:
                     bt_obj._df[column] = bt_obj.to_dataframe()[column].apply(
                         _convert_arrays_to_tuples
                     )
+                    bt_obj._search_index = None
 
         # New entries
         import pandas as pd
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import numpy as np
+    import pandas as pd
+
+# queries shorter than this match too many rows for the index to pay off
+MIN_INDEXED_QUERY_LENGTH = 2
+# separates the values of a field in the indexed text, queries can't span values
+SEPARATOR = "\x00"
+
+
+def search_fields(df: pd.DataFrame, field: str | list[str] | None) -> list[str]:
+    """The fields searched by `lamin_utils._search.search`, all string fields by default."""
+    from pandas.api.types import is_object_dtype, is_string_dtype
+
+    if field is None:
+        return [
+            f for f in df.columns if is_object_dtype(df[f]) or is_string_dtype(df[f])
+        ]
+    return [field] if isinstance(field, str) else list(field)
+
+
+class SearchIndex:
+    """Substring index over the fields of a table.
+
+    The lowercased values of a field are concatenated into one text with the
+    start offset of each value, so the rows containing a query are found with a
+    single substring scan of the text instead of matching every value.
+
+    Args:
+        df: The table to index, fields are indexed when first searched.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        # {field: (text, start offset of each row in text)}
+        self._fields: dict[str, tuple[str, np.ndarray]] = {}
+
+    def _indexed_field(self, field: str) -> tuple[str, np.ndarray]:
+        import numpy as np
+
+        if field not in self._fields:
+            # missing values stay missing when converted to strings and never match
+            values = self._df[field].astype(str).str.lower().fillna("").tolist()
+            lengths = np.fromiter((len(value) + 1 for value in values), dtype=np.int64)
+            starts = np.zeros(len(values), dtype=np.int64)
+            np.cumsum(lengths[:-1], out=starts[1:])
+            self._fields[field] = (SEPARATOR.join(values), starts)
+        return self._fields[field]
+
+    def candidates(self, string: str, fields: list[str]) -> np.ndarray:
+        """Positions of the rows that contain `string` in any field, ignoring case.
+
+        Returns all rows if the query is too short to be looked up in the index.
+        """
+        import numpy as np
+
+        query = string.lower()
+        if len(query) < MIN_INDEXED_QUERY_LENGTH or SEPARATOR in query:
+            return np.arange(len(self._df))
+        pattern = re.compile(re.escape(query))
+        rows = []
+        for field in fields:
+            text, starts = self._indexed_field(field)
+            # matches don't span values, so each match lies in one row
+            offsets = np.fromiter(
+                (match.start() for match in pattern.finditer(text)), dtype=np.int64
+            )
+            rows.append(np.searchsorted(starts, offsets, side="right") - 1)
+        if not rows:
+            return np.arange(0)
+        return np.unique(np.concatenate(rows))
+
+
+def search_candidates(
+    df: pd.DataFrame,
+    index: SearchIndex,
+    string: str,
+    *,
+    field: str | list[str] | None = None,
+    limit: int | None = None,
+    case_sensitive: bool = False,
+    show_rank: bool = False,
+) -> pd.DataFrame:
+    """Rank the candidate rows of `index` with `lamin_utils._search.search`."""
+    from lamin_utils._search import search
+
+    candidates = index.candidates(string, search_fields(df, field))
+    return search(
+        df=df.iloc[candidates],
+        string=string,
+        field=field,
+        limit=limit,
+        case_sensitive=case_sensitive,
+        _show_rank=show_rank,
+    )
+
+
+def _ranked_hits(
+    df: pd.DataFrame, index: SearchIndex, string: str, **kwargs
+) -> pd.DataFrame:
+    """The ontology_id, score and 1-based rank of the hits of a query."""
+    import pandas as pd
+
+    hits = search_candidates(df, index, string, show_rank=True, **kwargs)
+    ontology_ids = hits["ontology_id"] if "ontology_id" in hits.columns else hits.index
+    return pd.DataFrame(
+        {
+            "ontology_id": ontology_ids.to_numpy(),
+            "score": hits["rank"].to_numpy() if not hits.empty else [],
+            "rank": range(1, len(hits) + 1),
+        }
+    )
+
+
+# state of the worker processes of `search_many`, the table is sent once per worker
+_worker_args: tuple[pd.DataFrame, SearchIndex, dict] | None = None
+
+
+def _init_worker(df: pd.DataFrame, kwargs: dict) -> None:
+    global _worker_args
+    _worker_args = (df, SearchIndex(df), kwargs)
+
+
+def _ranked_hits_in_worker(string: str) -> pd.DataFrame:
+    df, index, kwargs = _worker_args
+    return _ranked_hits(df, index, string, **kwargs)
+
+
+def search_many(
+    df: pd.DataFrame,
+    strings: Iterable[str],
+    *,
+    index: SearchIndex | None = None,
+    n_workers: int = 1,
+    **kwargs,
+) -> pd.DataFrame:
+    """Search many strings against a table and return the hits in long format.
+
+    Args:
+        df: The table to search.
+        strings: The query strings, duplicates are searched once.
+        index: The index of `df`, built if not passed.
+        n_workers: Number of processes the queries are distributed over.
+        **kwargs: Are passed to `search_candidates`.
+
+    Returns:
+        A DataFrame with columns `query`, `ontology_id`, `score` and `rank`.
+    """
+    import pandas as pd
+
+    queries = list(dict.fromkeys(strings))
+    if n_workers > 1 and len(queries) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(df, kwargs)
+        ) as executor:
+            results = list(
+                executor.map(
+                    _ranked_hits_in_worker,
+                    queries,
+                    chunksize=-(-len(queries) // (n_workers * 4)),
+                )
+            )
+    else:
+        index = index if index is not None else SearchIndex(df)
+        results = [_ranked_hits(df, index, query, **kwargs) for query in queries]
+
+    columns = ["query", "ontology_id", "score", "rank"]
+    if not queries:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(
+        [
+            hits.assign(query=query)
+            for query, hits in zip(queries, results, strict=True)
+        ],
+        ignore_index=True,
+    )[columns]
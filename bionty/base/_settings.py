@@ -1,9 +1,16 @@
 import os
 from functools import wraps
 from pathlib import Path
+from typing import Literal
 
 ROOT_DIR = Path(__file__).parent.resolve()
 
+ASSETS_FRESHNESS_POLICIES = ("always", "ttl", "immutable")
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in {"1", "true", "yes"}
+
 
 def check_datasetdir_exists(f):
     @wraps(f)
@@ -38,6 +45,10 @@ class Settings:
             if dynamicdir is not None
             else (self.root_dir / "_dynamic/")
         )
+        self.offline = _env_flag("BIONTY_OFFLINE")
+        self.assets_freshness = os.getenv("BIONTY_ASSETS_FRESHNESS", "ttl")  # type: ignore
+        self.assets_ttl = float(os.getenv("BIONTY_ASSETS_TTL", 24 * 60 * 60))
+        self.shared_cachedir = os.getenv("BIONTY_SHARED_CACHE_DIR") or None
 
     @property
     def root_dir(self):
@@ -65,6 +76,67 @@ class Settings:
     def dynamicdir(self, dynamicdir: str | Path):
         self._dynamicdir = Path(dynamicdir).resolve()
 
+    @property
+    def offline(self) -> bool:
+        """Never access the network, only use locally cached files (default `False`).
+
+        Can also be set via the `BIONTY_OFFLINE=1` environment variable.
+        """
+        return self._offline
+
+    @offline.setter
+    def offline(self, offline: bool):
+        self._offline = bool(offline)
+
+    @property
+    def assets_freshness(self) -> Literal["always", "ttl", "immutable"]:
+        """When to check `s3://bionty-assets` for updates of a locally cached file.
+
+        - "always": check on every access
+        - "ttl": check if the last check is older than `assets_ttl` (default)
+        - "immutable": never check, cached filenames contain the source version
+
+        Can also be set via the `BIONTY_ASSETS_FRESHNESS` environment variable.
+        """
+        return self._assets_freshness
+
+    @assets_freshness.setter
+    def assets_freshness(self, policy: Literal["always", "ttl", "immutable"]):
+        if policy not in ASSETS_FRESHNESS_POLICIES:
+            raise ValueError(
+                f"assets_freshness must be one of {ASSETS_FRESHNESS_POLICIES}, got '{policy}'"
+            )
+        self._assets_freshness = policy
+
+    @property
+    def assets_ttl(self) -> float:
+        """Seconds a locally cached file is considered fresh under the "ttl" policy.
+
+        Can also be set via the `BIONTY_ASSETS_TTL` environment variable.
+        """
+        return self._assets_ttl
+
+    @assets_ttl.setter
+    def assets_ttl(self, ttl: float):
+        self._assets_ttl = float(ttl)
+
+    @property
+    def shared_cachedir(self) -> Path | None:
+        """Read-only directory with cached tables that is consulted before `dynamicdir`.
+
+        For example a directory on a network file system or in a container image
+        with an imported cache bundle, see `import_cache_bundle()`.
+
+        Can also be set via the `BIONTY_SHARED_CACHE_DIR` environment variable.
+        """
+        return self._shared_cachedir
+
+    @shared_cachedir.setter
+    def shared_cachedir(self, shared_cachedir: str | Path | None):
+        self._shared_cachedir = (
+            Path(shared_cachedir).resolve() if shared_cachedir is not None else None
+        )
+
     @property
     def public_sources(self):
         return self.root_dir / "sources.yaml"
@@ -19,6 +19,131 @@ def LAMINDB_INSTANCE_LOADED():
     return is_loaded
 
 
+SOURCE_COLUMNS = [
+    "entity",
+    "name",
+    "organism",
+    "version",
+    "url",
+    "description",
+    "source_website",
+]
+
+
+class SourceRegistry:
+    """Sources of a sources.yaml file, indexed by name and organism.
+
+    Rows keep the order of the yaml file and urls keep the `{version}` placeholder.
+    """
+
+    def __init__(self, rows: list[dict[str, str]]):
+        self.rows = rows
+        # {(name or None, organism or None): row positions}
+        self._index: dict[tuple[str | None, str | None], list[int]] = {}
+        for i, row in enumerate(rows):
+            for key in (
+                (None, None),
+                (row["name"], None),
+                (None, row["organism"]),
+                (row["name"], row["organism"]),
+            ):
+                self._index.setdefault(key, []).append(i)
+
+    def match(
+        self, name: str | None = None, organism: str | None = None
+    ) -> list[dict[str, str]]:
+        """Rows matching a source name and organism, `None` matches all."""
+        return [self.rows[i] for i in self._index.get((name, organism), [])]
+
+    def has_name(self, name: str) -> bool:
+        """Whether any source has this name."""
+        return (name, None) in self._index
+
+    def to_dataframe(self, url_pattern: bool = False) -> DataFrame:
+        """All sources as a DataFrame with columns `SOURCE_COLUMNS`."""
+        import pandas as pd
+
+        rows = self.rows
+        if not url_pattern:
+            rows = [
+                {**row, "url": row["url"].replace("{version}", row["version"])}
+                for row in rows
+            ]
+        return pd.DataFrame(rows, columns=SOURCE_COLUMNS)
+
+
+def _parse_rows(filepath: str | Path) -> list[dict[str, str]]:
+    all_rows = []
+    for entity, sources in load_yaml(filepath).items():
+        if entity == "version":
+            continue
+        for source, organism_source in sources.items():
+            name = organism_source.get("name", "")
+            website = organism_source.get("website", "")
+            for organism, versions in organism_source.items():
+                if organism in ["name", "website"]:
+                    continue
+                latest_version = str(versions.get("latest-version"))
+                url = versions.get("url")
+                row = (entity, source, organism, latest_version, url, name, website)
+                all_rows.append(dict(zip(SOURCE_COLUMNS, row, strict=True)))
+    return all_rows
+
+
+# {resolved path: ([mtime_ns, size], registry)}
+_source_registries: dict[str, tuple[list[int], SourceRegistry]] = {}
+
+
+def load_source_registry(filepath: str | Path | None = None) -> SourceRegistry:
+    """Load the compiled sources of a sources.yaml file.
+
+    The registry is kept in memory per process and re-read if the modification time
+    or size of the file changes. Parsed rows of `settings.public_sources` are also
+    cached as json in the dynamic directory so that new processes don't parse yaml.
+
+    Args:
+        filepath: Path to the sources yaml file, defaults to `settings.public_sources`.
+    """
+    import json
+
+    filepath = Path(filepath if filepath is not None else settings.public_sources)
+    stat = filepath.stat()
+    key = filepath.resolve().as_posix()
+    signature = [stat.st_mtime_ns, stat.st_size]
+    cached = _source_registries.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    rows = None
+    cache_path = None
+    if filepath.resolve() == settings.public_sources.resolve():
+        cache_path = settings.dynamicdir / "sources.json"
+        try:
+            cache = json.loads(cache_path.read_text())
+            if cache["path"] == key and cache["signature"] == signature:
+                rows = cache["rows"]
+        except (OSError, ValueError, KeyError):
+            pass
+    if rows is None:
+        rows = _parse_rows(filepath)
+        if cache_path is not None:
+            try:
+                from bionty.base.dev._io import atomic_write
+
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                with atomic_write(cache_path) as tmp_path:
+                    tmp_path.write_text(
+                        json.dumps({"path": key, "signature": signature, "rows": rows})
+                    )
+            except OSError:
+                # the cache is optional, e.g. for read-only installations
+                pass
+
+    registry = SourceRegistry(rows)
+    _source_registries[key] = (signature, registry)
+    return registry
+
+
 def parse_sources_yaml(
     filepath: str | Path = settings.public_sources,
     url_pattern: bool = False,
@@ -37,52 +162,26 @@ def parse_sources_yaml(
         - description
         - source_website
     """
-    all_rows = []
-    for entity, sources in load_yaml(filepath).items():
-        if entity == "version":
-            continue
-        for source, organism_source in sources.items():
-            name = organism_source.get("name", "")
-            website = organism_source.get("website", "")
-            for organism, versions in organism_source.items():
-                if organism in ["name", "website"]:
-                    continue
-                latest_version = str(versions.get("latest-version"))
-                url = versions.get("url")
-                if not url_pattern:
-                    url = url.replace("{version}", latest_version)
-                row = (entity, source, organism, latest_version, url, name, website)
-                all_rows.append(row)
+    return load_source_registry(filepath).to_dataframe(url_pattern=url_pattern)
 
-    import pandas as pd
 
-    return pd.DataFrame(
-        all_rows,
-        columns=[
-            "entity",
-            "name",
-            "organism",
-            "version",
-            "url",
-            "description",
-            "source_website",
-        ],
-    )
+def currently_used_rows(filepath: str | Path | None = None) -> list[dict[str, str]]:
+    """Rows of the most recent version of each source in a sources.yaml file."""
+    # the first version of each source is the current one
+    records: list = []
+    seen = set()
+    for row in load_source_registry(filepath).rows:
+        key = (row["entity"], row["organism"], row["name"])
+        if key not in seen:
+            seen.add(key)
+            records.append(row)
+    return records
 
 
 def parse_currently_used_sources(yaml: str | Path | list[dict]) -> dict:
     """Parse out the most recent versions from yaml."""
-    import pandas as pd
-
     if isinstance(yaml, str | Path):
-        df = parse_sources_yaml(yaml)
-        df_current = (
-            df[["entity", "name", "organism", "version"]]  # type: ignore
-            .drop_duplicates(["entity", "organism", "name"], keep="first")
-            .groupby(["entity", "organism", "name"], sort=False)
-            .max()
-        )
-        records = df_current.reset_index().to_dict(orient="records")
+        records = currently_used_rows(yaml)
     else:
         records = yaml
 
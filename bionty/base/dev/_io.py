@@ -1,15 +1,21 @@
+from __future__ import annotations
+
+import os
 import shutil
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-
-import requests  # type:ignore
-import yaml  # type:ignore
-from lamindb_setup.core.upath import UPath
-from rich.progress import Progress
+from typing import TYPE_CHECKING
 
 from bionty.base._settings import settings
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
 
 def load_yaml(filename: str | Path):  # pragma: no cover
+    import yaml  # type:ignore
+
     with open(filename) as f:
         return yaml.safe_load(f)
 
@@ -20,6 +26,8 @@ def write_yaml(
     sort_keys: bool = False,
     default_flow_style: bool = False,
 ):  # pragma: no cover
+    import yaml  # type:ignore
+
     with open(filename, "w") as f:
         yaml.dump(
             data,
@@ -29,15 +37,546 @@ def write_yaml(
         )
 
 
+# {lock path: [thread lock, depth, locked file]} of the locks held by this process
+_held_file_locks: dict[str, list] = {}
+_held_file_locks_guard = threading.Lock()
+
+
+def _lock_file(file, blocking: bool) -> bool:
+    if os.name == "nt":  # pragma: no cover
+        import msvcrt
+
+        while True:
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if not blocking:
+                    return False
+                import time
+
+                time.sleep(0.1)
+    else:
+        import fcntl
+
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(file.fileno(), flags)
+        except BlockingIOError:
+            return False
+        return True
+
+
+def _unlock_file(file) -> None:
+    if os.name == "nt":  # pragma: no cover
+        import msvcrt
+
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def _lock_path(path: str | Path) -> Path:
+    """The lock file of `path`, kept in a `.locks` directory next to it."""
+    path = Path(path)
+    return path.parent / ".locks" / f"{path.name}.lock"
+
+
+@contextmanager
+def file_lock(path: str | Path) -> Iterator[None]:
+    """Exclusive cross-process lock for writing `path`.
+
+    The lock is held on `_lock_path(path)` and is re-entrant within a thread,
+    so nested cache writes to the same path don't deadlock.
+
+    Example::
+
+        with file_lock(localpath):
+            if not localpath.exists():
+                url_download(url, localpath)
+    """
+    lock_path = _lock_path(path)
+    with _held_file_locks_guard:
+        entry = _held_file_locks.setdefault(
+            lock_path.as_posix(), [threading.RLock(), 0, None]
+        )
+    with entry[0]:
+        if entry[1] == 0:
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            file = open(lock_path, "a+b")
+            try:
+                if not _lock_file(file, blocking=False):
+                    from lamin_utils import logger
+
+                    logger.info(
+                        f"waiting for another process to write {Path(path).name}..."
+                    )
+                    _lock_file(file, blocking=True)
+            except BaseException:
+                file.close()
+                raise
+            entry[2] = file
+        entry[1] += 1
+        try:
+            yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                _unlock_file(entry[2])
+                entry[2].close()
+                entry[2] = None
+
+
+@contextmanager
+def atomic_write(path: str | Path) -> Iterator[Path]:
+    """Yield a temporary path that replaces `path` once the block succeeds.
+
+    Readers never see a partially written file at `path`.
+    If the block doesn't write the temporary path, `path` is left untouched.
+
+    Example::
+
+        with atomic_write(parquet_path) as tmp_path:
+            df.to_parquet(tmp_path)
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        yield tmp_path
+        if tmp_path.exists():
+            tmp_path.replace(path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def file_md5(path: str | Path, chunk_size: int = 1024 * 1024) -> str:
+    """Hex md5 checksum of a file, read in chunks."""
+    import hashlib
+
+    md5 = hashlib.md5()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def _md5_sidecar(path: Path) -> Path:
+    return path.with_name(f"{path.name}.md5")
+
+
+def _read_md5_sidecar(path: Path) -> dict | None:
+    """The sidecar of `path` if it was written for the current content of `path`."""
+    import json
+
+    stat = path.stat()
+    try:
+        sidecar = json.loads(_md5_sidecar(path).read_text())
+    except (OSError, ValueError):
+        return None
+    if sidecar.get("signature") != [stat.st_size, stat.st_mtime_ns]:
+        return None
+    return sidecar
+
+
+def _write_md5_sidecar(path: Path, **values) -> None:
+    """Update values in the sidecar of `path`, values for a previous content are dropped."""
+    import json
+
+    stat = path.stat()
+    sidecar = _read_md5_sidecar(path) or {}
+    sidecar.update(values, signature=[stat.st_size, stat.st_mtime_ns])
+    try:
+        with atomic_write(_md5_sidecar(path)) as tmp_path:
+            tmp_path.write_text(json.dumps(sidecar))
+    except OSError:
+        # the sidecar is optional, e.g. for read-only directories
+        pass
+
+
+def cached_md5(path: str | Path) -> str:
+    """Hex md5 checksum of a file, cached in a `.md5` sidecar file while the file is unchanged."""
+    path = Path(path)
+    sidecar = _read_md5_sidecar(path)
+    if sidecar is not None and "md5" in sidecar:
+        return sidecar["md5"]
+    md5 = file_md5(path)
+    _write_md5_sidecar(path, md5=md5)
+    return md5
+
+
+def cached_stat(path: str | Path, key: str, compute: Callable[[], int]) -> int:
+    """A statistic of a file, cached in its `.md5` sidecar file while the file is unchanged."""
+    path = Path(path)
+    sidecar = _read_md5_sidecar(path)
+    stats = sidecar.get("stats", {}) if sidecar is not None else {}
+    if key in stats:
+        return stats[key]
+    value = compute()
+    _write_md5_sidecar(path, stats={**stats, key: value})
+    return value
+
+
+def verify_md5(path: str | Path, md5: str) -> bool:
+    """Whether a file has the md5 checksum `md5`."""
+    return cached_md5(path) == md5
+
+
+def remove_cached_file(path: str | Path) -> None:
+    """Remove a cached file with its md5 sidecar and freshness marker."""
+    path = Path(path)
+    for file in (path, _md5_sidecar(path), _checked_marker(path)):
+        file.unlink(missing_ok=True)
+
+
+# downloads below this size are not split into ranges
+PARALLEL_DOWNLOAD_MIN_SIZE = 32 * 1024 * 1024
+MIN_BLOCK_SIZE = 64 * 1024
+MAX_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+# retries of requests failing with connection errors, 429 or 5xx responses
+HTTP_RETRIES = 3
+# the n-th retry waits HTTP_BACKOFF_FACTOR * 2 ** (n - 1) seconds
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_POOL_SIZE = 16
+
+# {retry: session}
+_http_sessions: dict = {}
+_http_session_lock = threading.Lock()
+# filesystems of s3_bionty_assets are reused within a thread, they aren't shared
+# between threads because s3_bionty_assets modifies their dircache
+_s3_roots = threading.local()
+
+
+def http_session(retry: bool = True):
+    """The keep-alive HTTP session shared by all network requests of bionty.
+
+    Connections are pooled per host and idempotent requests are retried with
+    exponential backoff, see `HTTP_RETRIES` and `HTTP_BACKOFF_FACTOR`.
+
+    Args:
+        retry: Whether failed requests are retried, e.g. not for existence probes.
+    """
+    with _http_session_lock:
+        session = _http_sessions.get(retry)
+        if session is None:
+            import requests  # type:ignore
+            from urllib3.util.retry import Retry
+
+            retries = Retry(
+                total=HTTP_RETRIES if retry else 0,
+                backoff_factor=HTTP_BACKOFF_FACTOR,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"HEAD", "GET"}),
+                # return the last response, errors are raised by the callers
+                raise_on_status=False,
+            )
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE,
+                pool_maxsize=HTTP_POOL_SIZE,
+                max_retries=retries,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_sessions[retry] = session
+    return session
+
+
+def _s3_root(assets_base_url: str):
+    """The UPath of `assets_base_url`, its filesystem is reused by the calling thread."""
+    roots = getattr(_s3_roots, "roots", None)
+    if roots is None:
+        roots = _s3_roots.roots = {}
+    root = roots.get(assets_base_url)
+    if root is None:
+        from lamindb_setup.core.upath import UPath
+
+        # this requires s3fs, but it is installed by lamindb
+        # skip_instance_cache=True to avoid interference with cached filesystems
+        # especially with their dircache
+        root = roots[assets_base_url] = UPath(
+            assets_base_url,
+            skip_instance_cache=True,
+            use_listings_cache=True,
+            anon=True,
+        )
+        # instantiate the filesystem, paths joined to root share it
+        _ = root.fs
+    return root
+
+
+def _adaptive_block_size(total_content_length: int) -> int:
+    """Buffer size that grows with the file, between 64 KiB and 8 MiB."""
+    if total_content_length <= 0:
+        return 1024 * 1024
+    return min(max(total_content_length // 100, MIN_BLOCK_SIZE), MAX_BLOCK_SIZE)
+
+
+def _range_validator(headers) -> str | None:
+    """The validator of a response for `If-Range` requests, a strong ETag or Last-Modified."""
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("last-modified")
+
+
+def _probe_url(url: str, **kwargs) -> tuple[int, bool, str | None] | None:
+    """Get the content length, whether the server accepts range requests and the range validator.
+
+    Returns `None` if the url is not reachable.
+    """
+    import requests  # type:ignore
+
+    try:
+        response = http_session().head(url, allow_redirects=True, **kwargs)
+    except requests.exceptions.RequestException:
+        return None
+    if response.status_code >= 400:
+        return None
+    total_content_length = int(response.headers.get("content-length", 0))
+    accept_ranges = response.headers.get("accept-ranges", "").lower() == "bytes"
+    return total_content_length, accept_ranges, _range_validator(response.headers)
+
+
+def is_gzipped(path: str | Path) -> bool:
+    """Whether a file path or url refers to a gzip-compressed file."""
+    return str(path).endswith(".gz")
+
+
+def gzip_compress(src: str | Path, dst: str | Path) -> None:
+    """Stream-compress `src` into `dst`."""
+    import gzip
+
+    with open(src, "rb") as fin, gzip.open(dst, "wb", compresslevel=6) as fout:
+        shutil.copyfileobj(fin, fout, MAX_BLOCK_SIZE)
+
+
+def gzip_decompress(src: str | Path, dst: str | Path) -> None:
+    """Stream-decompress `src` into `dst`."""
+    import gzip
+
+    with gzip.open(src, "rb") as fin, open(dst, "wb") as fout:
+        shutil.copyfileobj(fin, fout, MAX_BLOCK_SIZE)
+
+
+def _transcode(src: str | Path, dst: str | Path, src_gzipped: bool) -> None:
+    """Write `src` to `dst`, gzip-compressed if `dst` ends with `.gz`."""
+    with atomic_write(dst) as tmp_path:
+        if src_gzipped == is_gzipped(dst):
+            shutil.copy(src, tmp_path)
+        elif src_gzipped:
+            gzip_decompress(src, tmp_path)
+        else:
+            gzip_compress(src, tmp_path)
+
+
+def _download_stream(
+    url: str,
+    part_path: Path,
+    block_size: int | None,
+    resume: bool,
+    advance: Callable[[int], None] | None = None,
+    **kwargs,
+) -> str | None:
+    """Download in a single connection, appending to an existing part file.
+
+    The part file is only resumed if the server confirms via `If-Range` that the
+    file at `url` is unchanged, its validator is recorded in a `.json` sidecar.
+    Part files preallocated by `_download_ranges` are never resumed.
+
+    Returns the hex md5 checksum of the part file, computed while downloading.
+    """
+    import hashlib
+    import json
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    state_path = part_path.with_name(part_path.name + ".json")
+    offset = 0
+    if resume and part_path.exists() and state_path.exists():
+        state = json.loads(state_path.read_text())
+        if (
+            state.get("mode") == "stream"
+            and state.get("url") == url
+            and state.get("validator")
+        ):
+            offset = part_path.stat().st_size
+    if offset > 0:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = state["validator"]
+    with http_session().get(
+        url, stream=True, allow_redirects=True, headers=headers, **kwargs
+    ) as response:
+        if response.status_code == 416:
+            # the part file is already complete
+            state_path.unlink(missing_ok=True)
+            return None
+        response.raise_for_status()
+        # the server ignored the range header or the file changed, start from scratch
+        mode = "ab" if response.status_code == 206 else "wb"
+        validator = _range_validator(response.headers)
+        if validator is not None:
+            state_path.write_text(
+                json.dumps({"mode": "stream", "url": url, "validator": validator})
+            )
+        else:
+            # the part file can't be resumed
+            state_path.unlink(missing_ok=True)
+        md5 = hashlib.md5()
+        if mode == "ab":
+            # only the bytes of the interrupted download are read again
+            with open(part_path, "rb") as file:
+                for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                    md5.update(chunk)
+            if advance is not None:
+                advance(offset)
+        total_content_length = int(response.headers.get("content-length", 0))
+        with open(part_path, mode) as file:
+            for data in response.iter_content(
+                block_size or _adaptive_block_size(total_content_length)
+            ):
+                file.write(data)
+                md5.update(data)
+                if advance is not None:
+                    advance(len(data))
+    state_path.unlink(missing_ok=True)
+    return md5.hexdigest()
+
+
+def _download_ranges(
+    url: str,
+    part_path: Path,
+    total_content_length: int,
+    block_size: int | None,
+    n_workers: int,
+    resume: bool,
+    validator: str | None,
+    advance: Callable[[int], None] | None = None,
+    **kwargs,
+) -> None:
+    """Download byte ranges in parallel into a preallocated part file.
+
+    Progress of each range is recorded in a `.json` sidecar of the part file
+    so that an interrupted download only fetches the missing bytes. The progress
+    is only reused if the `validator` of the file at `url` and the ranges are unchanged.
+    """
+    import json
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    import requests  # type:ignore
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    block_size = block_size or _adaptive_block_size(total_content_length)
+    state_path = part_path.with_name(part_path.name + ".json")
+    # a few ranges per worker to balance slow connections
+    chunk_size = max(-(-total_content_length // (n_workers * 4)), MIN_BLOCK_SIZE)
+    starts = range(0, total_content_length, chunk_size)
+
+    done: dict[str, int] = {}
+    if resume and part_path.exists() and state_path.exists():
+        state = json.loads(state_path.read_text())
+        if (
+            validator is not None
+            and state.get("mode") == "ranges"
+            and state.get("chunk_size") == chunk_size
+            and state.get("validator") == validator
+            and state.get("size") == total_content_length
+            and state.get("url") == url
+        ):
+            done = state["done"]
+    if not done:
+        with open(part_path, "wb") as file:
+            file.truncate(total_content_length)
+        done = {str(start): 0 for start in starts}
+    if advance is not None:
+        advance(sum(done.values()))
+
+    lock = threading.Lock()
+
+    def save_state() -> None:
+        with lock:
+            state_path.write_text(
+                json.dumps(
+                    {
+                        "mode": "ranges",
+                        "url": url,
+                        "size": total_content_length,
+                        "chunk_size": chunk_size,
+                        "validator": validator,
+                        "done": done,
+                    }
+                )
+            )
+
+    def fetch(start: int) -> None:
+        end = min(start + chunk_size, total_content_length) - 1
+        offset = start + done[str(start)]
+        if offset > end:
+            return
+        range_headers = {**headers, "Range": f"bytes={offset}-{end}"}
+        if validator is not None:
+            # the ranges are only sent if the file didn't change since the probe
+            range_headers["If-Range"] = validator
+        try:
+            with http_session().get(
+                url, stream=True, allow_redirects=True, headers=range_headers, **kwargs
+            ) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise requests.exceptions.HTTPError(
+                        f"server ignored range request or file changed: {url}",
+                        response=response,
+                    )
+                with open(part_path, "r+b") as file:
+                    file.seek(offset)
+                    for data in response.iter_content(block_size):
+                        file.write(data)
+                        with lock:
+                            done[str(start)] += len(data)
+                        if advance is not None:
+                            advance(len(data))
+        finally:
+            save_state()
+
+    save_state()
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        # list() re-raises the first error
+        list(executor.map(fetch, starts))
+    state_path.unlink()
+
+
 def url_download(
-    url: str, localpath: str | Path | None = None, block_size: int = 1024, **kwargs
+    url: str,
+    localpath: str | Path | None = None,
+    block_size: int | None = None,
+    *,
+    n_workers: int = 4,
+    resume: bool = True,
+    md5: str | None = None,
+    **kwargs,
 ) -> str | Path | None:
     """Downloads a file to a specified path.
 
+    The file is written to a `.part` file and renamed to `localpath` once complete.
+    If the server supports range requests, large files are downloaded in
+    parallel chunks and interrupted downloads are resumed from the part file.
+
+    A `localpath` ending with `.gz` is stored gzip-compressed: the `{url}.gz` variant
+    is downloaded if the server provides it, otherwise the file is compressed
+    after download. A `.gz` url downloaded to a plain `localpath` is decompressed.
+
     Args:
         url: The URL to download.
         localpath: The path to download the file to.
-        block_size: Buffer size in bytes for sending a file-like message body.
+        block_size: Buffer size in bytes, adapts to the file size by default.
+        n_workers: Number of parallel connections for range requests.
+        resume: Whether to resume from an existing part file.
+        md5: Expected hex md5 checksum of the file at `url`.
         **kwargs: Keyword arguments are passed to 'requests'
 
     Returns:
@@ -45,64 +584,182 @@ def url_download(
 
     Raises:
         HttpError: If the request response is not 200 and OK.
+        ValueError: If the downloaded file doesn't match the `md5` checksum.
     """
     if url.startswith("file://"):
         url = url.split("file://")[-1]
-        shutil.copy(url, localpath)
+        if md5 is not None and file_md5(url) != md5:
+            raise ValueError(f"md5 checksum of '{url}' doesn't match {md5}")
+        _transcode(url, localpath, src_gzipped=is_gzipped(url))
         return localpath
+    if settings.offline:
+        raise ConnectionError(
+            f"cannot download {url}, bionty is in offline mode (settings.offline)"
+        )
+    if localpath is None:
+        localpath = url.split("/")[-1]
+    # only one process writes the part file
+    with file_lock(localpath):
+        return _url_download(
+            url, localpath, block_size, n_workers, resume, md5, **kwargs
+        )
+
+
+def _url_download(
+    url: str,
+    localpath: str | Path,
+    block_size: int | None,
+    n_workers: int,
+    resume: bool,
+    md5: str | None,
+    **kwargs,
+) -> str | Path:
+    import requests  # type:ignore
+
+    probe_kwargs = {k: v for k, v in kwargs.items() if k in {"headers", "timeout"}}
+    probe = None
+    # the md5 checksum is of the file at url, not of its compressed variant
+    if is_gzipped(localpath) and not is_gzipped(url) and md5 is None:
+        # prefer the compressed variant of the source if available
+        probe = _probe_url(f"{url}.gz", **probe_kwargs)
+        if probe is not None:
+            url = f"{url}.gz"
+    if probe is None:
+        probe = _probe_url(url, **probe_kwargs)
+    total_content_length, accept_ranges, validator = probe or (0, False, None)
+    # the part file holds the source as downloaded
+    part_path = Path(
+        f"{str(localpath).removesuffix('.gz')}{'.gz' if is_gzipped(url) else ''}.part"
+    )
     try:
-        response = requests.get(url, stream=True, allow_redirects=True, **kwargs)
-        response.raise_for_status()
+        parallel = (
+            accept_ranges
+            and n_workers > 1
+            and total_content_length >= PARALLEL_DOWNLOAD_MIN_SIZE
+        )
 
-        total_content_length = int(response.headers.get("content-length", 0))
-        if localpath is None:
-            localpath = url.split("/")[-1]
+        def download(advance: Callable[[int], None] | None = None) -> str | None:
+            if parallel:
+                # ranges are written out of order, no checksum while downloading
+                _download_ranges(
+                    url,
+                    part_path,
+                    total_content_length,
+                    block_size,
+                    n_workers,
+                    resume,
+                    validator,
+                    advance,
+                    **kwargs,
+                )
+                return None
+            else:
+                return _download_stream(
+                    url,
+                    part_path,
+                    block_size,
+                    resume and accept_ranges,
+                    advance,
+                    **kwargs,
+                )
 
         if total_content_length > 5000000:
+            from rich.progress import Progress
+
             with Progress(refresh_per_second=10, transient=True) as progress:
                 task = progress.add_task(
                     "[red]downloading...", total=total_content_length
                 )
-
-                with open(localpath, "wb") as file:
-                    for data in response.iter_content(block_size):
-                        file.write(data)
-                        progress.update(task, advance=block_size)
+                downloaded_md5 = download(lambda n: progress.update(task, advance=n))
                 # force the progress bar to 100% at the end
                 progress.update(task, completed=total_content_length, refresh=True)
         else:
-            with open(localpath, "wb") as file:
-                for data in response.iter_content(block_size):
-                    file.write(data)
+            downloaded_md5 = download()
 
+        if md5 is not None:
+            if downloaded_md5 is None:
+                downloaded_md5 = file_md5(part_path)
+            if downloaded_md5 != md5:
+                part_path.unlink()
+                raise ValueError(
+                    f"md5 checksum {downloaded_md5} of '{url}' doesn't match {md5}"
+                )
+        if is_gzipped(url) == is_gzipped(localpath):
+            part_path.replace(localpath)
+            if downloaded_md5 is not None:
+                _write_md5_sidecar(Path(localpath), md5=downloaded_md5)
+        else:
+            _transcode(part_path, localpath, src_gzipped=is_gzipped(url))
+            part_path.unlink()
         return localpath
 
     except requests.exceptions.HTTPError as err:
-        if err.response.status_code == 404:
+        if err.response is not None and err.response.status_code == 404:
             raise requests.exceptions.HTTPError(
                 f"URL not found (404): '{url}'. Check for typos."
             ) from err
         else:
+            status_code = err.response.status_code if err.response is not None else ""
             raise requests.exceptions.HTTPError(
-                f"HTTP error ({err.response.status_code}): {url}."
+                f"HTTP error ({status_code}): {url}."
             ) from err
 
 
+def shared_cache_path(filename: str) -> Path | None:
+    """Path of a file in `settings.shared_cachedir` if it's available there."""
+    if settings.shared_cachedir is None:
+        return None
+    path = settings.shared_cachedir / filename
+    return path if path.exists() else None
+
+
+def _checked_marker(localpath: Path) -> Path:
+    """Marker file whose modification time records the last remote check."""
+    return localpath.with_name(f"{localpath.name}.checked")
+
+
+def _is_fresh(localpath: Path) -> bool:
+    """Whether a cached file can be used without checking the remote."""
+    if not localpath.exists():
+        return False
+    if settings.offline or settings.assets_freshness == "immutable":
+        return True
+    if settings.assets_freshness == "ttl":
+        import time
+
+        marker = _checked_marker(localpath)
+        return (
+            marker.exists()
+            and time.time() - marker.stat().st_mtime < settings.assets_ttl
+        )
+    return False
+
+
 def s3_bionty_assets(
-    filename: str, localpath: Path = None, assets_base_url: str = "s3://bionty-assets"
+    filename: str,
+    localpath: Path = None,
+    assets_base_url: str = "s3://bionty-assets",
+    md5: str | None = None,
 ):
     """Synchronizes a S3 file path with local file storage.
 
     If the file does not exist locally it gets downloaded to datasetdir/filename or the passed localpath.
     If the file does not exist on S3, the file does not get synchronized, no erroring.
 
+    An existing local file is used without contacting S3 according to
+    `settings.assets_freshness`, and always if `settings.offline` is set.
+
     Args:
         filename: The suffix of the assets_base_url.
         localpath: Local base path of the file to sync.
         assets_base_url: The S3 base URL. Prefix of the filename.
+        md5: Expected hex md5 checksum of the file.
 
     Returns:
         A Path object of the synchronized path.
+
+    Raises:
+        ValueError: If the synchronized file doesn't match the `md5` checksum.
     """
     if localpath is None:
         localpath = settings.datasetdir / filename
@@ -111,37 +768,51 @@ def s3_bionty_assets(
             assert localpath.is_file(), (
                 f"localpath {localpath} has to be a file path, not a directory"
             )
-    # this requires s3fs, but it is installed by lamindb
-    # skip_instance_cache=True to avoid interference with cached filesystems
-    # especially with their dircache
-    remote_path = (
-        UPath(
-            assets_base_url,
-            skip_instance_cache=True,
-            use_listings_cache=True,
-            anon=True,
-        )
-        / filename
-    )
-    # check that the remote path exists and is available
-    try:
-        remote_stat = remote_path.stat()
-    except (FileNotFoundError, PermissionError):
+    if _is_fresh(localpath) or settings.offline:
         return localpath
-    # this is needed unfortunately because s3://bionty-assets doesn't have ListObjectsV2 for anonymous users.
-    # Moreover, ListObjectsV2 is triggered inside .synchronize if no cache is present.
-    # TODO: check if this is still needed
-    parent_path = remote_path.parent.path.rstrip("/")
-    remote_path.fs.dircache[parent_path] = [remote_stat.as_info()]
-    # synchronize the remote path
-    if hasattr(remote_path, "synchronize_to"):
-        remote_path.synchronize_to(
-            localpath, error_no_origin=False, print_progress=True
-        )
-    else:
+    remote_path = _s3_root(assets_base_url) / filename
+    # only one process synchronizes the file, the others wait and reuse it
+    with file_lock(localpath):
+        # another process might have synchronized the file while we waited
+        if _is_fresh(localpath):
+            return localpath
+        # check that the remote path exists and is available
+        try:
+            remote_stat = remote_path.stat()
+        except (FileNotFoundError, PermissionError):
+            return localpath
+        # this is needed unfortunately because s3://bionty-assets doesn't have ListObjectsV2 for anonymous users.
+        # Moreover, ListObjectsV2 is triggered inside .synchronize if no cache is present.
+        # TODO: check if this is still needed
+        parent_path = remote_path.parent.path.rstrip("/")
+        remote_path.fs.dircache[parent_path] = [remote_stat.as_info()]
         # UPath.synchronize is deprecated
-        remote_path.synchronize(localpath, error_no_origin=False, print_progress=True)
-    # clean the artificial cache
-    del remote_path.fs.dircache[parent_path]
+        synchronize = (
+            remote_path.synchronize_to
+            if hasattr(remote_path, "synchronize_to")
+            else remote_path.synchronize
+        )
+        try:
+            if not localpath.exists() or synchronize(
+                localpath, error_no_origin=False, just_check=True
+            ):
+                # synchronize into a temporary file, the modification time is kept on rename
+                with atomic_write(localpath) as tmp_path:
+                    synchronize(tmp_path, error_no_origin=False, print_progress=True)
+                    # the downloaded bytes are verified before they replace the file
+                    if md5 is not None and tmp_path.exists():
+                        downloaded_md5 = file_md5(tmp_path)
+                        if downloaded_md5 != md5:
+                            tmp_path.unlink()
+                            raise ValueError(
+                                f"md5 checksum {downloaded_md5} of '{remote_path}' doesn't match {md5}"
+                            )
+                if md5 is not None and localpath.exists():
+                    _write_md5_sidecar(localpath, md5=md5)
+            if localpath.exists():
+                _checked_marker(localpath).touch()
+        finally:
+            # clean the artificial cache
+            del remote_path.fs.dircache[parent_path]
 
     return localpath
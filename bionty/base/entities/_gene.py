@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, Literal, NamedTuple
 
 from lamin_utils import logger
 
-from bionty.base._public_ontology import PublicOntology
+from bionty.base._public_ontology import PublicOntology, read_table
 from bionty.base._settings import settings
 
 if TYPE_CHECKING:
@@ -13,7 +13,7 @@ if TYPE_CHECKING:
     from pandas import DataFrame
 from bionty.base.dev._doc_util import _doc_params
 from bionty.base.dev._handle_sources import LAMINDB_INSTANCE_LOADED
-from bionty.base.dev._io import s3_bionty_assets
+from bionty.base.dev._io import atomic_write, file_lock, s3_bionty_assets
 
 from ._organism import Organism
 from ._shared_docstrings import doc_entites
@@ -73,15 +73,23 @@ class Gene(PublicOntology):
             **kwargs,
         )
 
+    def _is_available(self) -> bool:
+        # genes of all ensembl organisms can be downloaded from the Ensembl database
+        return self.source == "ensembl" or super()._is_available()
+
     def _load_df(self):
         if self.source == "ensembl":
             df = super()._load_df()
             if df.empty:
-                # Load the Ensembl gene table
-                df = EnsemblGene(
-                    organism=self._organism, version=self._version, taxa=self.taxa
-                ).download_df()
-                df.to_parquet(self._local_parquet_path)
+                # only one process downloads the Ensembl gene table
+                with file_lock(self._local_parquet_path):
+                    if self._local_parquet_path.exists():
+                        return read_table(self._local_parquet_path)
+                    df = EnsemblGene(
+                        organism=self._organism, version=self._version, taxa=self.taxa
+                    ).download_df()
+                    with atomic_write(self._local_parquet_path) as tmp_path:
+                        df.to_parquet(tmp_path)
             return df
         return super()._load_df()
 
@@ -108,7 +116,8 @@ class Gene(PublicOntology):
     def map_legacy_ids(self, values: Iterable) -> MappingResult:
         """Convert legacy ids to current IDs.
 
-        This only works if the legacy ensembl ID has a reference to the current ensembl ID.
+        This only works if the legacy ensembl ID has a reference to the current ensembl ID,
+        either directly or through a chain of intermediate IDs across releases.
         It is possible that the HGNC IDs are identical, and the genomic locations are very close,
         but a mapping may still be absent.
 
@@ -123,27 +132,58 @@ class Gene(PublicOntology):
             gene.map_legacy_genes(["ENSG00000260150", "ENSG00000260587"])
         """
         if self.source != "ensembl":
-            raise NotImplementedError
+            raise NotImplementedError(
+                f"legacy IDs can only be mapped for ensembl sources, not {self.source}"
+            )
         if isinstance(values, str):
             values = [values]
         ensembl = EnsemblGene(organism=self.organism, version=self.version)
         legacy_df_filename = f"df-legacy_{self.organism}__{self.source}__{self.version}__{self.__class__.__name__}.parquet"
         legacy_df_localpath = settings.dynamicdir / legacy_df_filename
-        s3_bionty_assets(
-            filename=legacy_df_filename,
-            assets_base_url="s3://bionty-assets",
-            localpath=legacy_df_localpath,
+        # legacy tables with direct mappings only are extended with the chains
+        chains_localpath = settings.dynamicdir / legacy_df_filename.replace(
+            "df-legacy_", "df-legacy-chains_"
         )
-        try:
-            import pandas as pd
+        import pandas as pd
 
-            results = pd.read_parquet(legacy_df_localpath)
-        except FileNotFoundError:
-            raise NotImplementedError from None
+        with file_lock(legacy_df_localpath):
+            s3_bionty_assets(
+                filename=legacy_df_filename,
+                assets_base_url="s3://bionty-assets",
+                localpath=legacy_df_localpath,
+            )
+            results = (
+                pd.read_parquet(legacy_df_localpath)
+                if legacy_df_localpath.exists()
+                else None
+            )
+            if results is None or "n_hops" not in results.columns:
+                if chains_localpath.exists():
+                    results = pd.read_parquet(chains_localpath)
+                else:
+                    # materialize the resolved legacy ID chains once per release
+                    results, complete = ensembl._download_legacy_ids(
+                        self._df, events=results
+                    )
+                    if results.empty:
+                        logger.warning(
+                            f"no legacy IDs could be resolved for {self.organism} {self.version}"
+                        )
+                        return MappingResult(
+                            mapped={}, ambiguous={}, unmapped=list(values)
+                        )
+                    # chains resolved without all hops are not cached
+                    if complete:
+                        with atomic_write(chains_localpath) as tmp_path:
+                            results.to_parquet(tmp_path)
         results = results[results.old_stable_id.isin(values)].copy()
         return ensembl._process_convert_result(results, values=values)
 
 
+# current IDs per query of the legacy ID events
+LEGACY_ID_QUERY_BATCH_SIZE = 10_000
+
+
 class EnsemblGene:
     def __init__(
         self,
@@ -363,54 +403,110 @@ class EnsemblGene:
         return df_res
 
     def download_legacy_ids_df(
-        self, df: DataFrame, col: str | None = None
+        self,
+        df: DataFrame,
+        col: str | None = None,
+        max_hops: int = 50,
+        events: DataFrame | None = None,
     ) -> DataFrame:
         """Download legacy Ensembl gene IDs for the current IDs.
 
+        Gene `stable_id_event` mappings are fetched backwards from the current IDs,
+        one query per hop, and chains of old → intermediate → current IDs are
+        resolved across releases, see :func:`resolve_legacy_id_chains`.
+
         Args:
             df: DataFrame containing Ensembl gene IDs
             col: Column name in df that contains the Ensembl gene IDs
+            max_hops: Maximum number of consecutive mapping events to follow.
+            events: Already downloaded mapping events into the current IDs,
+                e.g. a legacy table with direct mappings only.
 
         Returns:
             DataFrame containing mapping between current and legacy IDs
         """
+        return self._download_legacy_ids(df, col, max_hops=max_hops, events=events)[0]
+
+    def _download_legacy_ids(
+        self,
+        df: DataFrame,
+        col: str | None = None,
+        max_hops: int = 50,
+        events: DataFrame | None = None,
+    ) -> tuple[DataFrame, bool]:
+        """The mapping of `download_legacy_ids_df` and whether all hops could be queried.
+
+        If a query fails, the chains are resolved from the events downloaded so far,
+        e.g. the direct mappings of `events`.
+        """
+        import pandas as pd
+
         col = "ensembl_gene_id" if col is None else col
 
-        # Filter out None/NaN values to prevent SQL errors
+        # Filter out None/NaN values
         valid_ids = df[df[col].notna()][col].tolist()
 
         # Handle empty list case
         if not valid_ids:
-            import pandas as pd
-
             logger.warning(
                 "No valid IDs found in the specified column. Returning empty DataFrame."
             )
-            return pd.DataFrame()
-
-        # Format for SQL IN clause - need to add quotes around each ID
-        formatted_ids = "(" + ", ".join(f"'{id}'" for id in valid_ids) + ")"
-
-        # Construct and execute query
-        query = f"""
-            SELECT * FROM stable_id_event
-            JOIN mapping_session USING (mapping_session_id)
-            WHERE type = 'gene'
-            AND new_stable_id IN {formatted_ids}
-            AND score > 0
-            AND old_stable_id != new_stable_id
-        """
-        # Execute the query and fetch results
+            return pd.DataFrame(), True
+
+        columns = ["old_stable_id", "new_stable_id", "score", "mapping_session_id"]
+        seen = set(valid_ids)
+        hops = []
+        complete = True
         try:
-            results = self._execute_query(query)
-            logger.info(f"Downloaded {len(results)} legacy ID mappings")
-            return results
+            if events is not None:
+                hops.append(events[columns])
+            else:
+                hops.append(self._query_legacy_id_events(seen))
+            for _ in range(max_hops - 1):
+                # old IDs of the last hop may be intermediates of longer chains
+                frontier = set(hops[-1]["old_stable_id"].dropna()) - seen
+                if not frontier:
+                    break
+                seen |= frontier
+                hops.append(self._query_legacy_id_events(frontier))
         except Exception as e:
-            import pandas as pd
+            if not hops:
+                logger.error(f"Error querying legacy IDs: {e}")
+                # Return an empty DataFrame rather than failing
+                return pd.DataFrame(), False
+            logger.warning(
+                f"Error querying legacy IDs, resolving the events downloaded so far: {e}"
+            )
+            complete = False
+        events = pd.concat(hops, ignore_index=True)
+        logger.info(f"Downloaded {len(events)} stable ID events in {len(hops)} hops")
 
-            logger.error(f"Error querying legacy IDs: {e}")
-            # Return an empty DataFrame rather than failing
-            return pd.DataFrame()
+        results = resolve_legacy_id_chains(
+            events, current_ids=valid_ids, max_hops=max_hops
+        )
+        logger.info(f"Resolved {len(results)} legacy ID mappings")
+        return results, complete
+
+    def _query_legacy_id_events(self, new_ids: Iterable[str]) -> DataFrame:
+        """Gene mapping events into `new_ids`, queried in batches."""
+        import pandas as pd
+
+        new_ids = sorted(new_ids)
+        batches = []
+        for start in range(0, len(new_ids), LEGACY_ID_QUERY_BATCH_SIZE):
+            batch = new_ids[start : start + LEGACY_ID_QUERY_BATCH_SIZE]
+            formatted_ids = "(" + ", ".join(f"'{id}'" for id in batch) + ")"
+            query = f"""
+                SELECT old_stable_id, new_stable_id, score, mapping_session_id
+                FROM stable_id_event
+                WHERE type = 'gene'
+                AND new_stable_id IN {formatted_ids}
+                AND old_stable_id IS NOT NULL
+                AND score > 0
+                AND old_stable_id != new_stable_id
+            """
+            batches.append(self._execute_query(query))
+        return pd.concat(batches, ignore_index=True)
 
     def map_legacy_ids(self, values: Iterable, df: DataFrame) -> MappingResult:
         """Maps legacy gene IDs to current Ensembl gene IDs.
@@ -488,6 +584,10 @@ class EnsemblGene:
         Returns:
             A MappingResult object with mapped, ambiguous, and unmapped entries
         """
+        # Resolved chains carry a path score, best candidates come first
+        if "n_hops" in results.columns:
+            results = results.sort_values("score", ascending=False, kind="stable")
+
         # Unique mappings
         mapper = (
             results.drop_duplicates(["old_stable_id"], keep=False)
@@ -516,3 +616,87 @@ class EnsemblGene:
         """Clean up database connection when the object is destroyed."""
         if hasattr(self, "_conn") and self._conn is not None and self._conn.open:
             self._conn.close()
+
+
+def resolve_legacy_id_chains(
+    events: DataFrame, current_ids: Iterable[str], max_hops: int = 50
+) -> DataFrame:
+    """Resolve chains of Ensembl `stable_id_event` mappings to current IDs.
+
+    A legacy ID retired several releases ago often maps to an intermediate ID
+    that was itself retired later. Chains are followed forward in time
+    (strictly increasing `mapping_session_id`) until a current ID is reached.
+    The score of a path is the product of the event scores along it.
+
+    Args:
+        events: `stable_id_event` rows with columns `old_stable_id`, `new_stable_id`,
+            `score` and `mapping_session_id`.
+        current_ids: Ensembl IDs of the current release.
+        max_hops: Maximum number of consecutive events to follow.
+
+    Returns:
+        A DataFrame with one row per (old_stable_id, new_stable_id) pair and columns
+        `old_stable_id`, `new_stable_id`, `score` (best path score) and `n_hops`.
+    """
+    import pandas as pd
+
+    columns = ["old_stable_id", "new_stable_id", "score", "n_hops"]
+    edges = events[
+        ["old_stable_id", "new_stable_id", "score", "mapping_session_id"]
+    ].dropna(subset=["old_stable_id", "new_stable_id"])
+    edges = edges[edges["old_stable_id"] != edges["new_stable_id"]].astype(
+        {"score": float}
+    )
+    current = pd.Index(pd.unique(pd.Series(list(current_ids), dtype=object)))
+
+    paths = pd.DataFrame(
+        {
+            "old_stable_id": edges["old_stable_id"],
+            "new_stable_id": edges["new_stable_id"],
+            "score": edges["score"],
+            "last_session": edges["mapping_session_id"],
+            "n_hops": 1,
+        }
+    )
+    resolved = []
+    for _ in range(max_hops):
+        is_current = paths["new_stable_id"].isin(current)
+        resolved.append(paths.loc[is_current, columns])
+        frontier = paths[~is_current]
+        if frontier.empty:
+            break
+        step = frontier.merge(
+            edges,
+            left_on="new_stable_id",
+            right_on="old_stable_id",
+            suffixes=("", "_next"),
+        )
+        step = step[
+            (step["mapping_session_id"] > step["last_session"])
+            & (step["new_stable_id_next"] != step["old_stable_id"])
+        ]
+        paths = pd.DataFrame(
+            {
+                "old_stable_id": step["old_stable_id"].values,
+                "new_stable_id": step["new_stable_id_next"].values,
+                "score": (step["score"] * step["score_next"]).values,
+                "last_session": step["mapping_session_id"].values,
+                "n_hops": (step["n_hops"] + 1).values,
+            }
+        )
+        # only the best path per endpoint and session needs to be extended
+        paths = paths.sort_values(
+            ["score", "n_hops"], ascending=[False, True]
+        ).drop_duplicates(["old_stable_id", "new_stable_id", "last_session"])
+
+    if not resolved:
+        return pd.DataFrame(columns=columns)
+    return (
+        pd.concat(resolved, ignore_index=True)
+        .sort_values(["score", "n_hops"], ascending=[False, True])
+        .drop_duplicates(["old_stable_id", "new_stable_id"])
+        .sort_values(
+            ["old_stable_id", "score", "n_hops"], ascending=[True, False, True]
+        )
+        .reset_index(drop=True)
+    )
@@ -9,7 +9,7 @@ from bionty.base.dev._doc_util import _doc_params
 
 if TYPE_CHECKING:
     from pandas import DataFrame
-from bionty.base.dev._io import s3_bionty_assets
+from bionty.base.dev._io import atomic_write, file_lock, s3_bionty_assets
 from bionty.base.entities._shared_docstrings import organism_removed
 
 
@@ -60,46 +60,49 @@ class Organism(PublicOntology):
         import pandas as pd
 
         if self.source == "ensembl":
-            if not self._local_parquet_path.exists():
-                # try to download from s3
-                s3_bionty_assets(
-                    filename=self._parquet_filename,
-                    assets_base_url="s3://bionty-assets",
-                    localpath=self._local_parquet_path,
-                )
-
-            # try to download from original url
-            if not self._local_parquet_path.exists():
-                self._url_download(self._url, self._local_ontology_path)  # type:ignore
-                df = pd.read_csv(
-                    self._local_ontology_path,
-                    sep="\t",
-                    index_col=False,  # type:ignore
-                )
-                df.rename(
-                    columns={
-                        "#name": "name",
-                        "species": "scientific_name",
-                        "taxonomy_id": "ontology_id",
-                    },
-                    inplace=True,
-                )
-                df["name"] = df["name"].str.lower()
-                df["ontology_id"] = "NCBITaxon:" + df["ontology_id"].astype(str)
-                df["scientific_name"] = df["scientific_name"].apply(
-                    lambda x: " ".join(
-                        [x.split("_")[0].capitalize()] + x.split("_")[1:]
+            # only one process downloads or converts the parquet file
+            with file_lock(self._local_parquet_path):
+                if not self._local_parquet_path.exists():
+                    # try to download from s3
+                    s3_bionty_assets(
+                        filename=self._parquet_filename,
+                        assets_base_url="s3://bionty-assets",
+                        localpath=self._local_parquet_path,
+                    )
+
+                # try to download from original url
+                if not self._local_parquet_path.exists():
+                    self._url_download(self._url, self._local_ontology_path)  # type:ignore
+                    df = pd.read_csv(
+                        self._local_ontology_path,
+                        sep="\t",
+                        index_col=False,  # type:ignore
+                    )
+                    df.rename(
+                        columns={
+                            "#name": "name",
+                            "species": "scientific_name",
+                            "taxonomy_id": "ontology_id",
+                        },
+                        inplace=True,
+                    )
+                    df["name"] = df["name"].str.lower()
+                    df["ontology_id"] = "NCBITaxon:" + df["ontology_id"].astype(str)
+                    df["scientific_name"] = df["scientific_name"].apply(
+                        lambda x: " ".join(
+                            [x.split("_")[0].capitalize()] + x.split("_")[1:]
+                        )
                     )
-                )
-                df["synonyms"] = None
-                df.to_parquet(self._local_parquet_path)
-                return df
-            else:
-                df = pd.read_parquet(self._local_parquet_path)
-                if "synonyms" not in df.columns:
-                    # add synonyms column if it doesn't exist
                     df["synonyms"] = None
-                return _standardize_scientific_name(df)
+                    with atomic_write(self._local_parquet_path) as tmp_path:
+                        df.to_parquet(tmp_path)
+                    return df
+                else:
+                    df = pd.read_parquet(self._local_parquet_path)
+                    if "synonyms" not in df.columns:
+                        # add synonyms column if it doesn't exist
+                        df["synonyms"] = None
+                    return _standardize_scientific_name(df)
         else:
             return super()._load_df()
 
@@ -9,18 +9,26 @@ Classes
    BioRecord
    StaticReference
    Settings
+   SourceUpgradePlan
 
 Functions
 ---------
 
 ... autofunction:: sync_public_sources
+... autofunction:: plan_records_to_source
+... autofunction:: set_currently_used
 """
 
 from bionty.models import BioRecord, StaticReference
 
 from ._add_ontology import add_ontology
 from ._settings import Settings
-from ._source import sync_public_sources
+from ._source import (
+    SourceUpgradePlan,
+    plan_records_to_source,
+    set_currently_used,
+    sync_public_sources,
+)
 
 # backward-compat
 sync_all_sources_to_latest = sync_public_sources
@@ -125,22 +125,30 @@ def create_link_records(
 def check_source_in_db(
     registry: type[BioRecord],
     source: Source,
-    n_all: int = None,
-    n_in_db: int = None,
+    n_all: int | None = None,
+    n_in_db: int | None = None,
 ) -> None:
+    """Set `source.in_db` to whether all terms of the source are in the registry.
+
+    Args:
+        registry: The registry of the records.
+        source: The source.
+        n_all: The number of terms of the source, read from the cached table metadata if not passed.
+        n_in_db: The number of records of the source in the registry, counted if not passed.
+    """
     if not hasattr(registry, "source_id"):
         logger.warning(f"no `source` field in the registry {registry.__name__}!")
     else:
-        n_all = n_all or registry.public(source=source).to_dataframe().shape[0]
-        # all records of the source in the database
-        n_in_db = n_in_db or registry.filter(source=source).count()
-        if n_in_db >= n_all:
-            # make sure in_db is set to True if all records are in the database
-            source.in_db = True
-            source.save()
-        else:
-            source.in_db = False
-            source.save()
+        if n_all is None:
+            n_all = registry.public(source=source)._n_terms(
+                exclude_obsolete=hasattr(registry, "ontology_id")
+            )
+        if n_in_db is None:
+            # all records of the source in the database
+            n_in_db = registry.filter(source=source).count()
+        # the source is only written if in_db changed
+        source.in_db = n_in_db >= n_all
+        source.save()
 
 
 def add_ontology_from_df(
@@ -154,6 +162,7 @@ def add_ontology_from_df(
     import lamindb as ln
 
     from bionty._source import get_source_record
+    from bionty._synonyms import index_stale_records
 
     source_record = get_source_record(registry, organism=organism, source=source)
     public = registry.public(source=source_record)
@@ -172,49 +181,59 @@ def add_ontology_from_df(
         df_all = df[df.index.isin(all_ontology_ids)]
 
     # do not create records from obsolete terms
-    if hasattr(registry, "ontology_id"):
+    exclude_obsolete = hasattr(registry, "ontology_id")
+    if exclude_obsolete:
         df_all = df_all[~df_all["name"].fillna("").str.startswith("obsolete")]
 
     n_all = df_all.shape[0]
     if n_all == 0:
         raise ValueError("No valid records to add!")
 
-    # all records of the source in the database
-    all_records = registry.filter(source=source_record).all()
-    n_in_db = all_records.count()
-
-    check_source_in_db(
-        registry=registry,
-        source=source_record,
-        n_all=n_all,
-        n_in_db=n_in_db,
-    )
+    # the number of records of the source is only needed if not all are imported
+    n_in_db = None
+    if ontology_ids is not None:
+        n_in_db = registry.filter(source=source_record).count()
 
     records = create_records(registry, df_new, source_record, organism)
     new_records = [r for r in records if r._state.adding]
     if ontology_ids is None:
         logger.info(f"adding {len(new_records)} new records")
     ln.save(new_records, ignore_conflicts=ignore_conflicts)
+    # the new records are marked as stale by the triggers, ids aren't set on them
+    index_stale_records(registry)
 
-    all_records = registry.filter(
-        source=source_record
-    ).all()  # need to update all_records after bulk_create
     if hasattr(registry, "parents"):
         source_has_parents = (
             "parents" in df_all.columns and not df_all["parents"].isna().all()
         )
 
         if source_has_parents:
-            link_records = create_link_records(registry, df_all, all_records)
-            new_link_records = [r for r in link_records if r._state.adding]
-            if ontology_ids is None:
-                logger.info(f"adding {len(new_link_records)} parents/children links")
-            ln.save(new_link_records, ignore_conflicts=ignore_conflicts)
+            # links are only created between the added terms
+            all_records = registry.filter(source=source_record)
+            if ontology_ids is not None:
+                all_records = all_records.filter(ontology_id__in=df_all.index.tolist())
+            all_records = list(all_records)
+            if all_records:
+                link_records = create_link_records(registry, df_all, all_records)
+                new_link_records = [r for r in link_records if r._state.adding]
+                if ontology_ids is None:
+                    logger.info(
+                        f"adding {len(new_link_records)} parents/children links"
+                    )
+                ln.save(new_link_records, ignore_conflicts=ignore_conflicts)
 
     if ontology_ids is None:
         logger.success("import is completed!")
         source_record.in_db = True
         source_record.save()
+    else:
+        # records of new terms weren't in the registry, so they are new in the source
+        check_source_in_db(
+            registry=registry,
+            source=source_record,
+            n_all=public._n_terms(exclude_obsolete=exclude_obsolete),
+            n_in_db=n_in_db + len(new_records),
+        )
 
 
 # used in save() to bulk save parents
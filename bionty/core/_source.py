@@ -1,15 +1,23 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 from lamin_utils import logger
 
 import bionty.base as bt_base
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from pathlib import Path
 
-    from lamindb.models import Artifact, SQLRecord
+    import pandas as pd
+    from lamindb.models import Artifact, QuerySet, SQLRecord
+    from pandas import DataFrame
+
+    from bionty.models import Source
+
+# number of records written per query when updating records to a new source
+UPDATE_BATCH_SIZE = 1_000
 
 
 def sync_public_sources(update_currently_used: bool = False) -> None:
@@ -28,56 +36,301 @@ def sync_public_sources(update_currently_used: bool = False) -> None:
 
         sync_public_sources()
     """
+    from django.db import transaction
+
     import bionty as bt
     from bionty._biorecord import list_biorecord_models
 
-    records = bt.Source.objects.filter().all()
     df_sources = bt_base.display_sources().reset_index()
+    df_sources = df_sources.astype(object).where(df_sources.notna(), None)
     bionty_models = list_biorecord_models(bt)
-    for kwargs in df_sources.to_dict(orient="records"):
-        if kwargs["entity"] in bionty_models:
-            kwargs["entity"] = "bionty." + kwargs["entity"]
-        record = records.filter(
-            name=kwargs["name"],
-            version=kwargs["version"],
-            entity=kwargs["entity"],
-            organism=kwargs["organism"],
-        ).all()
-        if len(record) == 0:
-            record = bt.Source(**kwargs).save()
-            logger.success(f"added new source: {record}")
-        else:
+    key_fields = ["entity", "organism", "name", "version"]
+
+    with transaction.atomic():
+        # all existing sources are fetched once and diffed with the public sources
+        existing = {
+            tuple(getattr(record, field) for field in key_fields): record
+            for record in bt.Source.objects.all()
+        }
+        to_create, to_update = [], []
+        for kwargs in df_sources.to_dict(orient="records"):
+            if kwargs["entity"] in bionty_models:
+                kwargs["entity"] = "bionty." + kwargs["entity"]
+            record = existing.get(tuple(kwargs[field] for field in key_fields))
+            if record is None:
+                to_create.append(bt.Source(**kwargs))
+                continue
             # update metadata fields
-            record.update(**kwargs)
             # if the record is in the trash, restore it
-            record.update(branch_id=1)
-            logger.success(f"updated source: {record.one()}")
-
-    if update_currently_used:
-        logger.info("setting the latest version as currently_used...")
-        # backwards compatible
-        df = (
-            records.to_dataframe() if hasattr(records, "to_dataframe") else records.df()
-        )
-        for (_, _, _), df_group in df.groupby(["entity", "organism", "name"]):
-            if df_group.currently_used.sum() == 0:
-                continue
-            latest_uid = df_group.sort_values("version", ascending=False).uid.iloc[0]
-            latest_record = records.get(uid=latest_uid)
-            latest_record.currently_used = True
-            latest_record.save()
+            kwargs["branch_id"] = 1
+            changed = {
+                field: value
+                for field, value in kwargs.items()
+                if getattr(record, field) != value
+            }
+            if changed:
+                for field, value in changed.items():
+                    setattr(record, field, value)
+                to_update.append(record)
+        if to_create:
+            bt.Source.objects.bulk_create(to_create)
+            logger.success(f"added {len(to_create)} new sources")
+        if to_update:
+            fields = [field for field in df_sources.columns if field not in key_fields]
+            bt.Source.objects.bulk_update(to_update, [*fields, "branch_id"])
+            logger.success(f"updated {len(to_update)} sources")
+
+        if update_currently_used:
+            logger.info("setting the latest version as currently_used...")
+            _set_latest_versions_currently_used()
 
     logger.success("synced up Source registry with the latest public sources")
 
 
-def update_records_to_source(registry: type[SQLRecord], source: SQLRecord) -> None:
-    """Update the existing records associated with old source to the new source.
+def set_currently_used(sources: Iterable[Source]) -> None:
+    """Set sources as currently used with bulk queries.
+
+    The other versions of the sources are set as not currently used.
+
+    Args:
+        sources: Source records, one version per entity, organism and source name.
+
+    Example::
+
+        import bionty as bt
+        from bionty.core import set_currently_used
+
+        set_currently_used(bt.Source.filter(name="cl", version="2024-08-16"))
+    """
+    from django.db import transaction
+    from django.db.models import Q
+
+    import bionty as bt
+
+    sources = list(sources)
+    versions: dict[tuple[str, str, str], Source] = {}
+    for source in sources:
+        key = (source.entity, source.organism, source.name)
+        if key in versions and versions[key].id != source.id:
+            raise ValueError(
+                f"only one version of {source.name} ({source.entity}, {source.organism})"
+                " can be currently used"
+            )
+        versions[key] = source
+    if not versions:
+        return None
+
+    ids = [source.id for source in versions.values()]
+    other_versions = Q()
+    for entity, organism, name in versions:
+        other_versions |= Q(entity=entity, organism=organism, name=name)
+    with transaction.atomic():
+        bt.Source.filter(other_versions).exclude(id__in=ids).update(
+            currently_used=False
+        )
+        bt.Source.filter(id__in=ids, currently_used=False).update(currently_used=True)
+    for source in sources:
+        source.currently_used = True
+        source._original_values["currently_used"] = True
+
+
+def _set_latest_versions_currently_used() -> None:
+    """Set the latest version of sources with a currently used version as currently_used."""
+    import pandas as pd
+
+    import bionty as bt
+
+    columns = ["id", "entity", "organism", "name", "version", "currently_used"]
+    df = pd.DataFrame.from_records(
+        list(bt.Source.objects.values_list(*columns)), columns=columns
+    )
+    group_fields = ["entity", "organism", "name"]
+    df = df[df.groupby(group_fields)["currently_used"].transform("any")]
+    latest = df.sort_values("version", ascending=False).drop_duplicates(group_fields)
+    is_latest = df["id"].isin(latest["id"])
+    bt.Source.objects.filter(
+        id__in=df.loc[is_latest, "id"].tolist(), currently_used=False
+    ).update(currently_used=True)
+    bt.Source.objects.filter(
+        id__in=df.loc[~is_latest & df["currently_used"], "id"].tolist()
+    ).update(currently_used=False)
+
+
+def _records_snapshot(
+    records: QuerySet, ontology_id_field: str, fields: list[str]
+) -> DataFrame:
+    """The ontology IDs and `fields` of records, and whether they have artifacts."""
+    import pandas as pd
+    from django.db.models import Exists, OuterRef
+
+    registry = records.model
+    through = registry.artifacts.through
+    linked_artifacts = through.objects.filter(
+        **{registry.artifacts.field.m2m_field_name(): OuterRef("pk")}
+    )
+    columns = ["id", ontology_id_field, *fields, "has_artifacts"]
+    values = records.annotate(has_artifacts=Exists(linked_artifacts)).values_list(
+        *columns
+    )
+    return pd.DataFrame.from_records(list(values), columns=columns)
+
+
+def _changed(old: pd.Series, new: pd.Series) -> pd.Series:
+    """Whether values changed, missing values are equal to each other."""
+    return ~((old == new) | (old.isna() & new.isna()))
+
+
+def _bulk_update_source(
+    registry: type[SQLRecord], source: SQLRecord, rows: DataFrame, fields: list[str]
+) -> list[SQLRecord]:
+    """Set the source and `fields` of the records in `rows` with one query per batch.
+
+    Returns:
+        The updated records, with the columns of `rows` loaded.
+    """
+    rows = rows.assign(source_id=source.id)
+    # from_db expects the values in the order of the model fields
+    attnames = [
+        field.attname
+        for field in registry._meta.concrete_fields
+        if field.attname in rows.columns
+    ]
+    updated = [
+        registry.from_db(registry.objects.db, attnames, values)
+        for values in rows[attnames].itertuples(index=False, name=None)
+    ]
+    registry.objects.bulk_update(
+        updated, [*fields, "source"], batch_size=UPDATE_BATCH_SIZE
+    )
+    return updated
+
+
+class SourceUpgradePlan(NamedTuple):
+    """Plan of updating the records of a registry to a new source.
+
+    Created by :func:`plan_records_to_source`, nothing is written before `execute()`.
+
+    Attributes:
+        registry: The registry of the records.
+        source: The new source.
+        ontology_id_field: The field records are matched on with the terms of the source.
+        updates: Records that are updated in place, their `id`, ontology ID, the fields
+            from the new source and their changed fields in column `changed_fields`,
+            separated by "|".
+        forks: Ontology IDs of records that are linked to artifacts and whose name
+            changed, new records are created for them.
+        obsolete: IDs of records that aren't in the new source, they are kept as is.
+    """
+
+    registry: type[SQLRecord]
+    source: SQLRecord
+    ontology_id_field: str
+    updates: DataFrame
+    forks: list[str]
+    obsolete: list[int]
+
+    def __repr__(self) -> str:
+        return (
+            f"SourceUpgradePlan({self.registry.__get_name_with_module__()}, "
+            f"source={self.source.name}/{self.source.version}, "
+            f"updated={len(self.updates)}, forked={len(self.forks)}, "
+            f"obsolete={len(self.obsolete)})"
+        )
+
+    def changed_counts(self) -> dict[str, int]:
+        """Number of records updated in place per changed field."""
+        fields = self.updates["changed_fields"].str.split("|").explode()
+        counts = fields[fields != ""].value_counts(sort=False)
+        return {field: int(n) for field, n in counts.items()}
+
+    def execute(self) -> None:
+        """Apply the plan with bulk queries."""
+        from bionty._synonyms import index_records, index_stale_records
+
+        registry, source = self.registry, self.source
+        if len(self.updates) == 0 and not self.forks and not self.obsolete:
+            return None
+        name_field = getattr(registry, "_name_field", "name")
+        fields = self.updates.columns.drop(
+            ["id", self.ontology_id_field, "changed_fields"]
+        )
+        # records are updated in groups of the same changed fields
+        for signature, rows in self.updates.groupby("changed_fields", sort=False):
+            changed_fields = signature.split("|") if signature else []
+            # the terms of the synonym index are read from the updated records
+            terms_changed = bool({name_field, "synonyms"} & set(changed_fields))
+            loaded = [
+                field
+                for field in (name_field, "synonyms")
+                if terms_changed and field in fields and field not in changed_fields
+            ]
+            updated = _bulk_update_source(
+                registry, source, rows[["id", *changed_fields, *loaded]], changed_fields
+            )
+            if terms_changed:
+                index_records(registry, updated)
+        if len(self.updates) > 0:
+            changed_counts = self.changed_counts()
+            n_unchanged = (self.updates["changed_fields"] == "").sum()
+            per_field = ", ".join(
+                f"{field}: {n}" for field, n in changed_counts.items()
+            )
+            logger.success(
+                f"{len(self.updates)} records updated to the new source: "
+                f"{len(self.updates) - n_unchanged} with changed fields ({per_field}), "
+                f"{n_unchanged} with unchanged fields"
+            )
+        if self.obsolete:
+            logger.warning(
+                f"{len(self.obsolete)} records are not in the new source, kept as is"
+            )
+
+        # create new records for those with name changes
+        if self.forks:
+            logger.info(f"creating {len(self.forks)} new records...")
+            registry.from_values(
+                self.forks,
+                field=getattr(registry, self.ontology_id_field),
+                source=source,
+            ).save()
+            index_stale_records(registry)
+            logger.success(
+                f"{len(self.forks)} new records created for records with artifacts "
+                "and a changed name!"
+            )
+
+        # set the source as currently used
+        if not source.currently_used:
+            set_currently_used([source])
+
+
+def plan_records_to_source(
+    registry: type[SQLRecord], source: SQLRecord
+) -> SourceUpgradePlan:
+    """Plan updating the existing records associated with old sources to a new source.
+
+    Records are matched to the terms of the new source by their ontology ID.
+    Records that are linked to artifacts and whose name changed are kept, a new record
+    is created from the new source instead. Nothing is written to the database.
 
     Args:
         registry: SQLRecord class to update.
         source: Source record to apply updates.
+
+    Returns:
+        The plan, apply it with `.execute()`.
+
+    Example::
+
+        import bionty as bt
+        from bionty.core import plan_records_to_source
+
+        source = bt.Source.get(entity="bionty.CellType", name="cl", version="2024-08-16")
+        plan = plan_records_to_source(bt.CellType, source)
+        plan.changed_counts()
+        plan.execute()
     """
-    import lamindb as ln
+    import pandas as pd
 
     from bionty._source import filter_public_df_columns
 
@@ -93,84 +346,82 @@ def update_records_to_source(registry: type[SQLRecord], source: SQLRecord) -> No
     }
     if hasattr(registry, "organism_id"):
         filter_kwargs["organism__name"] = source.organism
-    records = registry.filter(**filter_kwargs).exclude(source=source).all()
-    if len(records) == 0:
-        return
+    records = registry.filter(**filter_kwargs).exclude(source=source)
 
     # determine the ontology ID field to use
     ontology_id_field = getattr(registry, "_ontology_id_field", "ontology_id")
     name_field = getattr(registry, "_name_field", "name")
+    if not records.exists():
+        return SourceUpgradePlan(
+            registry=registry,
+            source=source,
+            ontology_id_field=ontology_id_field,
+            updates=pd.DataFrame(columns=["id", ontology_id_field, "changed_fields"]),
+            forks=[],
+            obsolete=[],
+        )
 
     # get the new data from the source
     public_df = filter_public_df_columns(registry, registry.public(source=source))
-    public_df.rename(columns={"parents": "_parents"}, inplace=True)
     if ontology_id_field not in public_df.columns:
         ontology_id_field = "stable_id" if "stable_id" in public_df.columns else None
         if not ontology_id_field:
             raise ValueError(
                 f"'{ontology_id_field}' column is not found in the source dataframe."
             )
+    # parents of existing records aren't updated
+    fields = [
+        field.name
+        for field in registry._meta.concrete_fields
+        if field.name in public_df.columns and field.name != ontology_id_field
+    ]
+    public_df = public_df.dropna(subset=[ontology_id_field]).drop_duplicates(
+        ontology_id_field, keep="last"
+    )
+    public_df = public_df[[ontology_id_field, *fields]].astype(object)
+    public_df = public_df.where(public_df.notna(), None)
+
+    # join the records with the new terms on the ontology ID
+    snapshot = _records_snapshot(records, ontology_id_field, fields)
+    in_source = snapshot[ontology_id_field].isin(public_df[ontology_id_field])
+    joined = snapshot.merge(
+        public_df, on=ontology_id_field, how="inner", suffixes=("_old", "")
+    )
+    changed = pd.DataFrame(
+        {field: _changed(joined[f"{field}_old"], joined[field]) for field in fields},
+        index=joined.index,
+        dtype=bool,
+    )
+
+    # records with artifacts keep their name, they are forked if it changed
+    if name_field in fields:
+        forked = joined["has_artifacts"] & changed[name_field]
+    else:
+        forked = pd.Series(False, index=joined.index)
+    updates = joined.loc[~forked, ["id", ontology_id_field, *fields]]
+    updates["changed_fields"] = (
+        changed[~forked].dot(changed.columns + "|").str.rstrip("|") if fields else ""
+    )
+    return SourceUpgradePlan(
+        registry=registry,
+        source=source,
+        ontology_id_field=ontology_id_field,
+        updates=updates.reset_index(drop=True),
+        forks=joined.loc[forked, ontology_id_field].tolist(),
+        obsolete=snapshot.loc[~in_source, "id"].tolist(),
+    )
 
-    # a dictionary of records indexed by ontology ID
-    public_dict = {row[ontology_id_field]: row for _, row in public_df.iterrows()}
-
-    # filter records that have matching ontology IDs
-    records = records.filter(
-        **{ontology_id_field + "__in": set(public_dict.keys())}
-    ).all()
-
-    # update records without artifacts
-    # simply update the record if no artifacts are associated
-    records_without_artifacts = records.filter(artifacts=None).all()
-    records_to_update = []
-    if records_without_artifacts:
-        for record in records_without_artifacts:
-            ontology_id = getattr(record, ontology_id_field)
-            # update all fields from the new source
-            for col in public_df.columns:
-                setattr(record, col, public_dict[ontology_id].get(col))
-            record.source_id = source.id
-            records_to_update.append(record)
-
-    # handle records with artifacts
-    records_with_artifacts = records.exclude(artifacts=None).all()
-    ontology_ids_for_new_records = []
-    for record in records_with_artifacts:
-        ontology_id = getattr(record, ontology_id_field)
-
-        # if name changed, create a new record
-        if (
-            ontology_id in public_dict
-            and hasattr(record, name_field)
-            and getattr(record, name_field) != public_dict[ontology_id].get(name_field)
-        ):
-            ontology_ids_for_new_records.append(ontology_id)
-        # otherwise, update the existing record
-        else:
-            for col in public_df.columns:
-                setattr(record, col, public_dict[ontology_id].get(col))
-            record.source_id = source.id
-            records_to_update.append(record)
-    # bulk update records with artifacts where name didn't change
-    if records_to_update:
-        logger.info(f"updating {len(records_to_update)} records...")
-        ln.save(records_to_update)
-        logger.success(f"{len(records_to_update)} records updated!")
-
-    # create new records for those with name changes
-    if ontology_ids_for_new_records:
-        logger.info(f"creating {len(ontology_ids_for_new_records)} new records...")
-        registry.from_values(
-            ontology_ids_for_new_records,
-            field=getattr(registry, ontology_id_field),
-            source=source,
-        ).save()
-        logger.success(f"{len(ontology_ids_for_new_records)} new records created!")
 
-    # set the source as currently used
-    if not source.currently_used:
-        source.currently_used = True
-        source.save()
+def update_records_to_source(registry: type[SQLRecord], source: SQLRecord) -> None:
+    """Update the existing records associated with old source to the new source.
+
+    See :func:`plan_records_to_source` for which records are updated.
+
+    Args:
+        registry: SQLRecord class to update.
+        source: Source record to apply updates.
+    """
+    plan_records_to_source(registry, source).execute()
 
 
 def register_source_in_bionty_assets(
@@ -211,6 +462,8 @@ def register_source_in_bionty_assets(
     """
     import lamindb as ln
 
+    from bionty.base.dev._io import file_md5
+
     # assert ln.setup.settings.instance.slug == "laminlabs/bionty-assets"
 
     if "." not in source.entity:
@@ -250,6 +503,7 @@ def register_source_in_bionty_assets(
         assert version == source.version
         assert entity == source.entity.split(".")[-1]
         source.dataframe_artifact = artifact
+        source.md5 = file_md5(artifact.cache())
         source.save()
         logger.print(
             f"linked Source(uid={source.uid}) to dataframe_artifact {artifact}"
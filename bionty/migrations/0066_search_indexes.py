@@ -0,0 +1,144 @@
+# Generated by Django 5.2 on 2026-10-18 12:00
+
+from django.db import DatabaseError, migrations, transaction
+from lamin_utils import logger
+
+# the search indexes as of this migration, frozen so that later changes of
+# bionty._search don't change what the migration does
+_ONTOLOGY_FIELDS = ("name", "ontology_id", "uid", "abbr", "synonyms", "description")
+SEARCH_INDEX_FIELDS = {
+    "bionty_organism": (*_ONTOLOGY_FIELDS, "scientific_name"),
+    "bionty_gene": (
+        "uid",
+        "abbr",
+        "synonyms",
+        "description",
+        "symbol",
+        "stable_id",
+        "ensembl_gene_id",
+        "ncbi_gene_ids",
+        "biotype",
+    ),
+    "bionty_protein": (
+        "uid",
+        "abbr",
+        "synonyms",
+        "description",
+        "name",
+        "uniprotkb_id",
+        "gene_symbol",
+        "ensembl_gene_ids",
+    ),
+    "bionty_cellmarker": (
+        "uid",
+        "abbr",
+        "synonyms",
+        "description",
+        "name",
+        "gene_symbol",
+        "ncbi_gene_id",
+        "uniprotkb_id",
+    ),
+    **{
+        f"bionty_{name}": _ONTOLOGY_FIELDS
+        for name in (
+            "tissue",
+            "celltype",
+            "disease",
+            "cellline",
+            "phenotype",
+            "pathway",
+            "experimentalfactor",
+            "developmentalstage",
+            "ethnicity",
+        )
+    },
+}
+
+
+def _sqlite_triggers(table):
+    return [f"{table}_search_{event}" for event in ("ai", "ad", "au")]
+
+
+def _create_postgres_index(schema_editor, table, fields):
+    qn = schema_editor.connection.ops.quote_name
+    values = " || '|' || ".join(f"COALESCE({qn(field)}::text, '')" for field in fields)
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {qn(f'{table}_search_trgm')} ON {qn(table)} "
+        f"USING gin ((UPPER({values})) gin_trgm_ops)"
+    )
+
+
+def _create_sqlite_index(schema_editor, table, fields):
+    fts = f"{table}_search"
+    insert, delete, update = _sqlite_triggers(table)
+    columns = ", ".join(fields)
+    new_values = ", ".join(f"new.{field}" for field in fields)
+    old_values = ", ".join(f"old.{field}" for field in fields)
+    # an external content table, the triggers keep it in sync with the table
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({columns}, content='{table}', "
+        "content_rowid='id', tokenize='trigram')"
+    )
+    add = f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values});"
+    remove = (
+        f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {insert} AFTER INSERT ON {table} BEGIN {add} END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {delete} AFTER DELETE ON {table} BEGIN {remove} END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {update} AFTER UPDATE ON {table} BEGIN {remove} {add} END"
+    )
+    schema_editor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def create_search_indexes(apps, schema_editor):
+    """Create the search indexes of the tables in `SEARCH_INDEX_FIELDS`.
+
+    Postgres gets trigram GIN indexes, which requires the `pg_trgm` extension.
+    SQLite gets FTS5 tables with the trigram tokenizer, available since SQLite 3.34.
+    If neither is available, registries are searched without index.
+    """
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        create_index = _create_postgres_index
+    elif connection.vendor == "sqlite":
+        create_index = _create_sqlite_index
+    else:
+        return None
+    try:
+        with transaction.atomic(using=connection.alias):
+            if connection.vendor == "postgresql":
+                schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for table, fields in SEARCH_INDEX_FIELDS.items():
+                create_index(schema_editor, table, fields)
+    except DatabaseError as e:
+        logger.warning(f"registries are searched without index: {e}")
+
+
+def drop_search_indexes(apps, schema_editor):
+    """Drop the search indexes created by `create_search_indexes`."""
+    connection = schema_editor.connection
+    qn = connection.ops.quote_name
+    for table in SEARCH_INDEX_FIELDS:
+        if connection.vendor == "postgresql":
+            schema_editor.execute(f"DROP INDEX IF EXISTS {qn(f'{table}_search_trgm')}")
+        elif connection.vendor == "sqlite":
+            for trigger in _sqlite_triggers(table):
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_search")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bionty", "0065_squashed"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
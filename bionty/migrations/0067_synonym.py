@@ -0,0 +1,218 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:37
+
+import lamindb.base.fields
+from django.db import DatabaseError, migrations, models, transaction
+from lamin_utils import logger
+
+# the synonym index as of this migration, frozen so that later changes of
+# bionty._synonyms don't change what the migration does
+SYNONYM_INDEX_NAME_FIELDS = {
+    "Organism": "name",
+    "Gene": "symbol",
+    "Protein": "name",
+    "CellMarker": "name",
+    "Tissue": "name",
+    "CellType": "name",
+    "Disease": "name",
+    "CellLine": "name",
+    "Phenotype": "name",
+    "Pathway": "name",
+    "ExperimentalFactor": "name",
+    "DevelopmentalStage": "name",
+    "Ethnicity": "name",
+}
+BATCH_SIZE = 5_000
+_SYNONYM_TABLE = "bionty_synonym"
+_POSTGRES_FUNCTION = "bionty_synonym_mark_stale"
+
+
+def record_terms(name, synonyms):
+    """The lowercased terms of a record, its name always comes first."""
+    terms = [name.lower() if name else ""]
+    if synonyms:
+        terms += [synonym.lower() for synonym in synonyms.split("|") if synonym]
+    return list(dict.fromkeys(terms))
+
+
+def _table(registry_name):
+    return f"bionty_{registry_name.lower()}"
+
+
+def _triggers(table):
+    return [f"{table}_synonym_{event}" for event in ("ai", "ad", "au")]
+
+
+def _create_postgres_triggers(schema_editor, registry_name, name_field):
+    qn = schema_editor.connection.ops.quote_name
+    table = _table(registry_name)
+    insert, delete, update = _triggers(table)
+    execute = (
+        f"FOR EACH ROW EXECUTE FUNCTION {_POSTGRES_FUNCTION}('bionty.{registry_name}')"
+    )
+    changed = " OR ".join(
+        f"OLD.{qn(field)} IS DISTINCT FROM NEW.{qn(field)}"
+        for field in (name_field, "synonyms")
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {qn(insert)} AFTER INSERT ON {qn(table)} {execute}"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {qn(delete)} AFTER DELETE ON {qn(table)} {execute}"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {qn(update)} AFTER UPDATE OF {qn(name_field)}, synonyms "
+        f"ON {qn(table)} WHEN ({changed}) {execute}"
+    )
+
+
+def _create_sqlite_triggers(schema_editor, registry_name, name_field):
+    table = _table(registry_name)
+    insert, delete, update = _triggers(table)
+    entity = f"'bionty.{registry_name}'"
+    mark = (
+        f"INSERT INTO {_SYNONYM_TABLE}(registry, record_id, term) "
+        f"VALUES ({entity}, new.id, NULL);"
+    )
+    remove = (
+        f"DELETE FROM {_SYNONYM_TABLE} WHERE registry = {entity} "
+        "AND record_id = old.id;"
+    )
+    changed = " OR ".join(
+        f"old.{field} IS NOT new.{field}" for field in (name_field, "synonyms")
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {insert} AFTER INSERT ON {table} BEGIN {mark} END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {delete} AFTER DELETE ON {table} BEGIN {remove} END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {update} AFTER UPDATE OF {name_field}, synonyms ON {table} "
+        f"WHEN {changed} BEGIN {remove} {mark} END"
+    )
+
+
+def create_synonym_triggers(apps, schema_editor):
+    """Create the triggers that mark records as stale in the synonym index.
+
+    A record that is created or whose name or synonyms change, also through bulk updates,
+    gets a row without term until its terms are indexed by a write to the registry.
+    Without triggers, registries are standardized without index.
+    """
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        create_triggers = _create_postgres_triggers
+    elif connection.vendor == "sqlite":
+        create_triggers = _create_sqlite_triggers
+    else:
+        return None
+    try:
+        with transaction.atomic(using=connection.alias):
+            if connection.vendor == "postgresql":
+                schema_editor.execute(
+                    f"CREATE OR REPLACE FUNCTION {_POSTGRES_FUNCTION}() "
+                    "RETURNS trigger AS $$ BEGIN "
+                    "IF TG_OP <> 'INSERT' THEN "
+                    f"DELETE FROM {_SYNONYM_TABLE} "
+                    "WHERE registry = TG_ARGV[0] AND record_id = OLD.id; END IF; "
+                    "IF TG_OP <> 'DELETE' THEN "
+                    f"INSERT INTO {_SYNONYM_TABLE} (registry, record_id, term) "
+                    "VALUES (TG_ARGV[0], NEW.id, NULL); END IF; "
+                    "RETURN NULL; END $$ LANGUAGE plpgsql"
+                )
+            for registry_name, name_field in SYNONYM_INDEX_NAME_FIELDS.items():
+                create_triggers(schema_editor, registry_name, name_field)
+    except DatabaseError as e:
+        logger.warning(f"registries are standardized without synonym index: {e}")
+
+
+def drop_synonym_triggers(apps, schema_editor):
+    """Drop the triggers created by `create_synonym_triggers`."""
+    connection = schema_editor.connection
+    qn = connection.ops.quote_name
+    if connection.vendor not in {"postgresql", "sqlite"}:
+        return None
+    for registry_name in SYNONYM_INDEX_NAME_FIELDS:
+        table = _table(registry_name)
+        for trigger in _triggers(table):
+            if connection.vendor == "postgresql":
+                schema_editor.execute(
+                    f"DROP TRIGGER IF EXISTS {qn(trigger)} ON {qn(table)}"
+                )
+            else:
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    if connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP FUNCTION IF EXISTS {_POSTGRES_FUNCTION}()")
+
+
+def backfill_synonym_index(apps, schema_editor):
+    """Index the terms of the records that exist before the synonym index."""
+    Synonym = apps.get_model("bionty", "Synonym")
+    db = schema_editor.connection.alias
+    for registry_name, name_field in SYNONYM_INDEX_NAME_FIELDS.items():
+        registry = apps.get_model("bionty", registry_name)
+        last_id = 0
+        while True:
+            batch = list(
+                registry.objects.using(db)
+                .filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", name_field, "synonyms")[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+            ids = [record_id for record_id, _, _ in batch]
+            Synonym.objects.using(db).filter(
+                registry=f"bionty.{registry_name}", record_id__in=ids
+            ).delete()
+            Synonym.objects.using(db).bulk_create(
+                Synonym(
+                    registry=f"bionty.{registry_name}", record_id=record_id, term=term
+                )
+                for record_id, name, synonyms in batch
+                for term in record_terms(name, synonyms)
+            )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("bionty", "0066_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Synonym",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "registry",
+                    lamindb.base.fields.CharField(
+                        blank=True, default=None, max_length=64
+                    ),
+                ),
+                (
+                    "record_id",
+                    lamindb.base.fields.BigIntegerField(blank=True, default=None),
+                ),
+                (
+                    "term",
+                    lamindb.base.fields.TextField(blank=True, default=None, null=True),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["registry", "term"],
+                        name="bionty_syno_registr_9bb1aa_idx",
+                    ),
+                    models.Index(
+                        fields=["registry", "record_id"],
+                        name="bionty_syno_registr_4fa1de_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(create_synonym_triggers, drop_synonym_triggers),
+        migrations.RunPython(backfill_synonym_index, migrations.RunPython.noop),
+    ]
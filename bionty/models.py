@@ -9,7 +9,7 @@
 from __future__ import annotations
 
 import functools
-from typing import TYPE_CHECKING, overload
+from typing import TYPE_CHECKING, Literal, overload
 
 import numpy as np
 from django.core.exceptions import FieldDoesNotExist
@@ -23,6 +23,7 @@ from lamindb.base.fields import (
     ForeignKey,
     TextField,
 )
+from lamindb.base.utils import strict_classmethod
 from lamindb.errors import DoesNotExist, InvalidArgument
 from lamindb.models import (
     Artifact,
@@ -37,6 +38,7 @@ from lamindb.models import (
     TracksRun,
     TracksUpdates,
 )
+from lamindb.models.query_manager import SEARCH_QUERY_DEFAULT_LIMIT
 
 import bionty.base as bt_base
 from bionty.base.dev._doc_util import _doc_params
@@ -48,7 +50,10 @@ from .base._public_ontology import InvalidParamError
 from .uids import ontology, source
 
 if TYPE_CHECKING:
-    from lamindb.base.types import FieldAttr
+    from pathlib import Path
+
+    from lamindb.base.types import FieldAttr, ListLike, StrField
+    from lamindb.models import QuerySet
     from pandas import DataFrame
 
 
@@ -59,16 +64,117 @@ class StaticReference(PublicOntology):
             source=source_record.name,
             version=source_record.version,
             organism=source_record.organism,
+            md5=source_record.md5 if source_record.dataframe_artifact_id else None,
         )
+        if source_record.dataframe_artifact_id:
+            self._filter_prefix = False
+
+    def _fetch_sources(self) -> None:
+        # the source is defined by the record, not by sources.yaml
+        self._all_sources = None
+
+    def _match_sources(self, *args, **kwargs) -> dict[str, str]:
+        source_record = self._source_record
+        return {
+            "name": source_record.name,
+            "version": source_record.version,
+            "organism": source_record.organism,
+            "url": source_record.url or "",
+            "description": source_record.description,
+            "source_website": source_record.source_website,
+        }
+
+    def _is_available(self) -> bool:
+        # the table is the dataframe artifact of the record, if any
+        return True
+
+    def _read_source_columns(self) -> list[str] | None:
+        import pyarrow.parquet as pq
+
+        if not self._source_record.dataframe_artifact_id:
+            return []
+        artifact = self._source_record.dataframe_artifact
+        if artifact.suffix != ".parquet":
+            return None
+        try:
+            with artifact.path.open("rb") as file:
+                return pq.read_schema(file).names
+        except Exception as e:
+            logger.debug(f"couldn't read the schema of {artifact}: {e}")
+            return None
+
+    def _set_file_paths(self) -> None:
+        super()._set_file_paths()
+        if self._source_record.dataframe_artifact_id:
+            # the table of the artifact is cached by its hash like the public sources
+            artifact = self._source_record.dataframe_artifact
+            self._parquet_filename = None  # type:ignore
+            self._local_ontology_path = None  # type:ignore
+            self._local_parquet_path = (
+                bt_base.settings.dynamicdir
+                / f"df_artifact__{artifact.hash or artifact.uid}.parquet"
+            )
 
     def _load_df(self) -> DataFrame:
+        import shutil
+
         import pandas as pd
 
-        if self._source_record.dataframe_artifact_id:
-            self._filter_prefix = False
-            return self._source_record.dataframe_artifact.load(is_run_input=False)
-        else:
+        from bionty.base._public_ontology import read_table
+        from bionty.base.dev._io import (
+            atomic_write,
+            file_lock,
+            remove_cached_file,
+            verify_md5,
+        )
+
+        if not self._source_record.dataframe_artifact_id:
             return pd.DataFrame()
+        parquet_path = self._local_parquet_path
+        with file_lock(parquet_path):
+            if (
+                self._md5 is not None
+                and parquet_path.exists()
+                and not verify_md5(parquet_path, self._md5)
+            ):
+                logger.warning(
+                    f"cached {parquet_path.name} doesn't match the md5 checksum of the source, fetching it again..."
+                )
+                remove_cached_file(parquet_path)
+            if not parquet_path.exists():
+                artifact = self._source_record.dataframe_artifact
+                if artifact.suffix == ".parquet":
+                    # the file of the artifact is cached as is, Source.md5 is its checksum
+                    with atomic_write(parquet_path) as tmp_path:
+                        shutil.copyfile(self._artifact_cache(artifact), tmp_path)
+                else:
+                    self._artifact_cache(artifact)
+                    df = artifact.load(is_run_input=False)
+                    with atomic_write(parquet_path) as tmp_path:
+                        df.to_parquet(tmp_path)
+        return read_table(parquet_path)
+
+    def _artifact_cache(self, artifact: Artifact) -> Path:
+        """The local file of an artifact, fetched again if it doesn't match `Source.md5`."""
+        from pathlib import Path
+
+        from bionty.base.dev._io import file_md5
+
+        cache_path = Path(artifact.cache(is_run_input=False))
+        if self._md5 is None or file_md5(cache_path) == self._md5:
+            return cache_path
+        # only a cached copy of a file in the cloud can be fetched again
+        if cache_path.as_posix() != artifact.path.as_posix():
+            logger.warning(
+                f"cached file of {artifact} doesn't match the md5 checksum of the source, fetching it again..."
+            )
+            cache_path.unlink()
+            cache_path = Path(artifact.cache(is_run_input=False))
+            if file_md5(cache_path) == self._md5:
+                return cache_path
+        raise ValueError(
+            f"file of {artifact} doesn't match the md5 checksum {self._md5} of {self._source_record}"
+        )
 
 
 def pass_to_super(cls_method):
@@ -118,7 +224,11 @@ class Source(SQLRecord, TracksRun, TracksUpdates):
     url: str | None = TextField(null=True, default=None)
     """URL of the source file."""
     md5: str | None = TextField(null=True, default=None)
-    """Hash md5 of the source file."""
+    """Hash md5 of the source file.
+
+    For sources with a `dataframe_artifact`, the md5 of the file of the artifact,
+    which is verified when loading the table.
+    """
     source_website: str | None = TextField(null=True, default=None)
     """Website of the source."""
     dataframe_artifact: Artifact = ForeignKey(
@@ -158,10 +268,36 @@ class Source(SQLRecord, TracksRun, TracksUpdates):
         kwargs = encode_uid(registry=Source, kwargs=kwargs)
         super().__init__(*args, **kwargs)
 
+    def _is_unchanged(self) -> bool:
+        """Whether the record is saved and no field changed since it was loaded or saved."""
+        from django.db.models.base import DEFERRED
+
+        if self._state.adding or self.pk is None or self._original_values is None:
+            return False
+        return all(
+            original is not DEFERRED and self.__dict__.get(field, DEFERRED) == original
+            for field, original in self._original_values.items()
+        )
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        super().refresh_from_db(*args, **kwargs)
+        self._populate_tracked_fields()
+
     def save(self, *args, **kwargs) -> Source:
-        """Save the source record."""
-        update = self.currently_used and self.pk
+        """Save the source record.
+
+        Unchanged records aren't written. If a saved record is set as currently used,
+        the other versions of the source are set as not currently used.
+        """
+        if not args and not kwargs and self._is_unchanged():
+            return self
+        update = (
+            self.currently_used
+            and self.pk is not None
+            and self._original_values.get("currently_used") is not True
+        )
         super().save(*args, **kwargs)
+        self._populate_tracked_fields()
         # when update currently_used, set all other records of the same source as not currently used
         if update:
             Source.filter(
@@ -170,6 +306,10 @@ class Source(SQLRecord, TracksRun, TracksUpdates):
         return self
 
 
+# all fields are tracked to skip writing unchanged sources in Source.save()
+Source._TRACK_FIELDS = tuple(field.attname for field in Source._meta.concrete_fields)
+
+
 class HasOntologyId(models.Model, HasParents):
     """HasOntologyId - base class for standard ontologies.
 
@@ -424,9 +564,13 @@ class HasSource(models.Model):
 
         # Save dataframe artifact and update source
         if df_artifact:
+            from bionty.base.dev._io import file_md5
+
             df_artifact.kind = "__lamindb_run__"
             df_artifact.save()
             new_source.dataframe_artifact = df_artifact
+            # the md5 checksum of the file of the artifact is verified when loading it
+            new_source.md5 = file_md5(df_artifact.cache(is_run_input=False))
             new_source.save()
 
         logger.success(
@@ -513,7 +657,9 @@ class HasSource(models.Model):
 
         try:
             return getattr(bt_base, cls.__name__)(
-                organism=organism, source=source_name, version=version
+                organism=organism,
+                source=source_name,
+                version=version,
             )
         except InvalidParamError as e:
             raise ValueError(str(e)) from None
@@ -734,6 +880,90 @@ class BioRecord(SQLRecord, HasSource, CanCurate):
 
         return required
 
+    @classmethod
+    def search(
+        cls,
+        string: str,
+        *,
+        field: StrField | list[StrField] | None = None,
+        limit: int | None = SEARCH_QUERY_DEFAULT_LIMIT,
+        case_sensitive: bool = False,
+    ) -> QuerySet:
+        """Search the records of the registry.
+
+        Candidate records are looked up in the search index of the registry,
+        a trigram index in Postgres and an FTS5 table in SQLite, before they're ranked.
+
+        Args:
+            string: The input string to match against the field values.
+            field: The field or fields to search. Search all string fields by default.
+            limit: Maximum amount of top results to return.
+            case_sensitive: Whether the match is case sensitive.
+
+        Returns:
+            A `QuerySet` of the records sorted by rank.
+
+        Example::
+
+            import bionty as bt
+
+            bt.CellType.search("gamma delta T cell")
+        """
+        from ._search import filter_search_candidates, search_field_names
+
+        if string is None:
+            raise ValueError(
+                "Cannot search for None value! Please pass a valid string."
+            )
+        candidates = filter_search_candidates(
+            cls.objects.all(), string, search_field_names(cls, field)
+        )
+        return candidates.search(
+            string, field=field, limit=limit, case_sensitive=case_sensitive
+        )
+
+    @strict_classmethod
+    def standardize(
+        cls, values: ListLike, field: StrField | None = None, **kwargs
+    ) -> list[str] | dict[str, str]:
+        """Maps input synonyms to standardized names.
+
+        Takes the same arguments as :meth:`~lamindb.models.CanCurate.standardize`.
+        Only the records whose name or synonyms match the values are loaded,
+        they're looked up in the :class:`~bionty.models.Synonym` index.
+
+        Example::
+
+            import bionty as bt
+
+            bt.CellType.standardize(["T-cell", "B lymphocyte"])
+        """
+        from ._synonyms import filter_standardize_candidates
+
+        queryset = cls.filter().all()
+        field_name = (
+            field if field is None or isinstance(field, str) else field.field.name
+        )
+        # names and synonyms are looked up in the synonym index,
+        # other fields are standardized without synonyms
+        if kwargs.get("synonyms_field", "synonyms") == "synonyms" and field_name in {
+            None,
+            cls._name_field,
+        }:
+            queryset = filter_standardize_candidates(queryset, values)
+        return queryset.standardize(values, field=field, **kwargs)
+
+    def _terms_changed(self) -> bool:
+        """Whether the name or synonyms changed since the record was loaded or saved."""
+        from django.db.models.base import DEFERRED
+
+        if self._state.adding or self.pk is None or self._original_values is None:
+            return True
+        return any(
+            original is DEFERRED or self.__dict__.get(field, DEFERRED) != original
+            for field, original in self._original_values.items()
+        )
+
     def save(self, *args, **kwargs) -> BioRecord:
         """Save the record and its parents recursively.
 
@@ -744,7 +974,15 @@ class BioRecord(SQLRecord, HasSource, CanCurate):
             record = bt.CellType.from_source(name="T cell")
             record.save()
         """
+        from ._synonyms import index_records, index_stale_records
+
+        terms_changed = self._terms_changed()
         super().save(*args, **kwargs)
+        if terms_changed:
+            index_records(self.__class__, [self])
+            # records changed by bulk updates are indexed along
+            index_stale_records(self.__class__)
+            self._populate_tracked_fields()
         # saving records of parents
         if hasattr(self, "_parents"):
             import lamindb as ln
@@ -2473,6 +2711,49 @@ class RecordEthnicity(BaseSQLRecord, IsLink, TracksRun):
         unique_together = ("record", "value", "feature")
 
 
+class Synonym(BaseSQLRecord):
+    """Lowercased names and synonyms of bionty records, one row per term.
+
+    Database triggers mark records whose name or synonyms change with a row without term,
+    their terms are indexed when records are saved or imported from a source.
+    Used by :meth:`~bionty.models.BioRecord.standardize` to look up values with an indexed join,
+    unless the registry has stale records.
+    """
+
+    class Meta:
+        app_label = "bionty"
+        indexes = [
+            models.Index(fields=["registry", "term"]),
+            models.Index(fields=["registry", "record_id"]),
+        ]
+
+    id: int = models.BigAutoField(primary_key=True)
+    registry: str = CharField(max_length=64)
+    """The registry of the record, e.g. `"bionty.CellType"`."""
+    record_id: int = BigIntegerField()
+    """The id of the record in its registry."""
+    term: str | None = TextField(null=True)
+    """The lowercased name or a lowercased synonym of the record, `None` if it's stale."""
+
+
+# the terms of the synonym index are tracked, records are only reindexed if they change
+for _registry in (
+    Organism,
+    Gene,
+    Protein,
+    CellMarker,
+    Tissue,
+    CellType,
+    Disease,
+    CellLine,
+    Phenotype,
+    Pathway,
+    ExperimentalFactor,
+    DevelopmentalStage,
+    Ethnicity,
+):
+    _registry._TRACK_FIELDS = (_registry._name_field, "synonyms")
+
 # backward compat
 Species = Organism
 BiontySource = Source
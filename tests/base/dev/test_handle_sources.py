@@ -3,6 +3,7 @@ from pathlib import Path
 
 import pytest
 from bionty.base.dev._handle_sources import (
+    load_source_registry,
     parse_currently_used_sources,
     parse_sources_yaml,
 )
@@ -64,3 +65,33 @@ def test_parse_current_versions(versions_yaml_replica):
     }
 
     assert parse_currently_used_sources(versions_yaml_replica) == expected
+
+
+def test_load_source_registry(versions_yaml_replica):
+    import os
+
+    registry = load_source_registry(versions_yaml_replica)
+    # loaded once per process
+    assert load_source_registry(versions_yaml_replica) is registry
+
+    assert [row["organism"] for row in registry.match(name="ensembl")] == [
+        "vertebrates",
+        "human",
+        "mouse",
+    ]
+    assert registry.match(name="ensembl", organism="mouse")[0]["url"] == (
+        "s3://bionty-assets/df_mouse__ensembl__{version}__Gene.parquet"
+    )
+    assert registry.match(name="cl", organism="human") == []
+    assert registry.has_name("cl")
+    assert not registry.has_name("mondo")
+
+    # the registry is re-read when the file changes
+    content = Path(versions_yaml_replica).read_text()
+    Path(versions_yaml_replica).write_text(content.replace("cl:", "clo:"))
+    stat = Path(versions_yaml_replica).stat()
+    os.utime(versions_yaml_replica, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    registry_new = load_source_registry(versions_yaml_replica)
+    assert registry_new is not registry
+    assert registry_new.has_name("clo")
+    assert not registry_new.has_name("cl")
@@ -1,8 +1,82 @@
+import multiprocessing
 import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
-from bionty.base.dev._io import url_download
+from bionty.base._settings import settings
+from bionty.base.dev import _io
+from bionty.base.dev._io import (
+    atomic_write,
+    file_lock,
+    s3_bionty_assets,
+    url_download,
+)
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """Serves `server.files` and supports single byte range requests."""
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body: bool):
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            self.send_error(503)
+            return
+        content = self.server.files.get(self.path)
+        if content is None:
+            self.send_error(404)
+            return
+        start, end = 0, len(content) - 1
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if (
+            range_header
+            and self.server.accept_ranges
+            and if_range in {None, self.server.etag}
+        ):
+            first, last = range_header.removeprefix("bytes=").split("-")
+            start, end = int(first), int(last) if last else end
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+        else:
+            self.send_response(200)
+        if self.server.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if self.server.etag is not None:
+            self.send_header("ETag", self.server.etag)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if body:
+            self.server.requested_paths.append(self.path)
+            self.server.requested_ranges.append((start, end))
+            self.wfile.write(content[start : end + 1])
+
+    def do_HEAD(self):
+        self._send(body=False)
+
+    def do_GET(self):
+        self._send(body=True)
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+    server.content = bytes(range(256)) * 4096  # 1 MiB
+    server.files = {"/source.owl": server.content}
+    server.accept_ranges = True
+    server.etag = '"v1"'
+    server.failures = 0
+    server.requested_ranges = []
+    server.requested_paths = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}/source.owl"
+    server.shutdown()
 
 
 @pytest.fixture
@@ -23,6 +97,31 @@ def test_url_download(local):
     assert downloaded_path.exists()
 
 
+def test_url_download_compressed(http_server, tmp_path):
+    import gzip
+
+    server, url = http_server
+
+    # the source is compressed after download
+    localpath = tmp_path / "source.owl.gz"
+    url_download(url, localpath)
+    assert gzip.decompress(localpath.read_bytes()) == server.content
+    assert not (tmp_path / "source.owl.part").exists()
+
+    # the compressed variant is preferred if available
+    server.files["/source.owl.gz"] = gzip.compress(server.content)
+    server.requested_paths.clear()
+    localpath.unlink()
+    url_download(url, localpath)
+    assert server.requested_paths == ["/source.owl.gz"]
+    assert gzip.decompress(localpath.read_bytes()) == server.content
+
+    # a compressed source is decompressed for a plain local path
+    plain_path = tmp_path / "plain.owl"
+    url_download(f"{url}.gz", plain_path)
+    assert plain_path.read_bytes() == server.content
+
+
 def test_local_file():
     with tempfile.TemporaryDirectory() as temp_dir:
         local_file = Path(temp_dir) / "test.txt"
@@ -41,3 +140,231 @@ def test_local_file():
 
         if downloaded_path.exists():
             downloaded_path.unlink()
+
+
+def test_url_download_parallel_ranges(http_server, tmp_path, monkeypatch):
+    server, url = http_server
+    monkeypatch.setattr(_io, "PARALLEL_DOWNLOAD_MIN_SIZE", 1024)
+    localpath = tmp_path / "source.owl"
+
+    url_download(url, localpath, n_workers=4)
+
+    assert localpath.read_bytes() == server.content
+    assert len(server.requested_ranges) > 1
+    assert not (tmp_path / "source.owl.part").exists()
+    assert not (tmp_path / "source.owl.part.json").exists()
+
+
+def test_url_download_resume(http_server, tmp_path):
+    import json
+
+    server, url = http_server
+    localpath = tmp_path / "source.owl"
+    part_path = tmp_path / "source.owl.part"
+    state_path = tmp_path / "source.owl.part.json"
+    part_path.write_bytes(server.content[:1000])
+    state_path.write_text(
+        json.dumps({"mode": "stream", "url": url, "validator": server.etag})
+    )
+
+    url_download(url, localpath)
+
+    assert localpath.read_bytes() == server.content
+    assert server.requested_ranges == [(1000, len(server.content) - 1)]
+    assert not part_path.exists()
+    assert not state_path.exists()
+
+    # a part file of a changed file is discarded
+    server.requested_ranges.clear()
+    part_path.write_bytes(b"garbage")
+    state_path.write_text(
+        json.dumps({"mode": "stream", "url": url, "validator": '"v0"'})
+    )
+    url_download(url, localpath)
+    assert localpath.read_bytes() == server.content
+    assert server.requested_ranges == [(0, len(server.content) - 1)]
+
+    # a part file without validator isn't resumed
+    server.requested_ranges.clear()
+    part_path.write_bytes(b"garbage")
+    url_download(url, localpath)
+    assert localpath.read_bytes() == server.content
+    assert server.requested_ranges == [(0, len(server.content) - 1)]
+
+    # without range support the part file is discarded
+    server.accept_ranges = False
+    server.requested_ranges.clear()
+    part_path.write_bytes(b"garbage")
+    state_path.write_text(
+        json.dumps({"mode": "stream", "url": url, "validator": server.etag})
+    )
+    url_download(url, localpath)
+    assert localpath.read_bytes() == server.content
+    assert server.requested_ranges == [(0, len(server.content) - 1)]
+
+
+def test_url_download_resume_other_mode(http_server, tmp_path, monkeypatch):
+    import json
+
+    server, url = http_server
+    monkeypatch.setattr(_io, "PARALLEL_DOWNLOAD_MIN_SIZE", 1024)
+    localpath = tmp_path / "source.owl"
+    part_path = tmp_path / "source.owl.part"
+    state_path = tmp_path / "source.owl.part.json"
+    size = len(server.content)
+    ranges_state = {
+        "mode": "ranges",
+        "url": url,
+        "size": size,
+        "chunk_size": size // 16,
+        "validator": server.etag,
+        "done": {str(start): 0 for start in range(0, size, size // 16)},
+    }
+
+    # a preallocated part file of an interrupted parallel download isn't streamed on
+    part_path.write_bytes(bytes(size))
+    state_path.write_text(json.dumps(ranges_state))
+    url_download(url, localpath, n_workers=1)
+    assert localpath.read_bytes() == server.content
+    assert server.requested_ranges == [(0, size - 1)]
+
+    # the progress of other ranges is discarded
+    server.requested_ranges.clear()
+    part_path.write_bytes(bytes(size))
+    state_path.write_text(json.dumps({**ranges_state, "chunk_size": size // 2}))
+    url_download(url, localpath, n_workers=4)
+    assert localpath.read_bytes() == server.content
+    assert sum(end - start + 1 for start, end in server.requested_ranges) == size
+    assert not state_path.exists()
+
+
+def _write_once(path: Path, log_path: Path):
+    with file_lock(path):
+        if not path.exists():
+            with open(log_path, "a") as log:
+                log.write("written\n")
+            with atomic_write(path) as tmp_path:
+                tmp_path.write_text("partial")
+                time.sleep(0.2)
+                tmp_path.write_text("complete")
+    assert path.read_text() == "complete"
+
+
+def test_file_lock_single_writer(tmp_path):
+    path = tmp_path / "cache" / "df.parquet"
+    log_path = tmp_path / "writes.log"
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=_write_once, args=(path, log_path)) for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert all(process.exitcode == 0 for process in processes)
+    assert log_path.read_text() == "written\n"
+    assert path.read_text() == "complete"
+    assert not list(path.parent.glob("*.tmp"))
+
+
+def test_file_lock_reentrant(tmp_path):
+    path = tmp_path / "df.parquet"
+    with file_lock(path):
+        with file_lock(path):
+            with atomic_write(path) as tmp:
+                tmp.write_text("done")
+    assert path.read_text() == "done"
+    # locks are kept out of the cache directory
+    assert sorted(file.name for file in tmp_path.iterdir()) == [".locks", "df.parquet"]
+
+    # a failing write leaves no trace
+    with pytest.raises(RuntimeError), atomic_write(path) as tmp:
+        tmp.write_text("partial")
+        raise RuntimeError
+    assert path.read_text() == "done"
+
+
+def test_url_download_md5(http_server, tmp_path):
+    import hashlib
+
+    server, url = http_server
+    md5 = hashlib.md5(server.content).hexdigest()
+    localpath = tmp_path / "source.owl"
+    url_download(url, localpath, md5=md5)
+    # the checksum computed while downloading is kept in a sidecar file
+    assert _io.verify_md5(localpath, md5)
+    assert "md5" in (tmp_path / "source.owl.md5").read_text()
+
+    with pytest.raises(ValueError):
+        url_download(url, tmp_path / "mismatch.owl", md5="0" * 32)
+    assert not (tmp_path / "mismatch.owl").exists()
+
+
+def test_url_download_retries(http_server, tmp_path):
+    server, url = http_server
+    server.failures = 2
+    localpath = tmp_path / "source.owl"
+    url_download(url, localpath)
+    assert localpath.read_bytes() == server.content
+    # connections are kept alive between requests
+    assert _io.http_session() is _io.http_session()
+
+
+@pytest.fixture
+def no_s3(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("remote was accessed")
+
+    monkeypatch.setattr(_io, "_s3_root", fail)
+    freshness, ttl, offline = (
+        settings.assets_freshness,
+        settings.assets_ttl,
+        settings.offline,
+    )
+    yield
+    settings.assets_freshness, settings.assets_ttl, settings.offline = (
+        freshness,
+        ttl,
+        offline,
+    )
+
+
+def test_s3_bionty_assets_fresh_cache(tmp_path, no_s3):
+    localpath = tmp_path / "df_all__cl__2024-08-16__CellType.parquet"
+    localpath.write_bytes(b"cached")
+
+    settings.assets_freshness = "immutable"
+    assert s3_bionty_assets(localpath.name, localpath) == localpath
+
+    settings.assets_freshness = "ttl"
+    (tmp_path / f"{localpath.name}.checked").touch()
+    assert s3_bionty_assets(localpath.name, localpath) == localpath
+    settings.assets_ttl = 0
+    with pytest.raises(AssertionError, match="remote was accessed"):
+        s3_bionty_assets(localpath.name, localpath)
+
+    settings.assets_freshness = "always"
+    settings.offline = True
+    assert s3_bionty_assets(localpath.name, localpath) == localpath
+    # nothing is downloaded in offline mode
+    missing = tmp_path / "missing.parquet"
+    assert s3_bionty_assets(missing.name, missing) == missing
+    with pytest.raises(ConnectionError, match="offline"):
+        url_download("https://example.com/missing.owl", missing)
+
+    with pytest.raises(ValueError):
+        settings.assets_freshness = "sometimes"
+
+
+def test_cached_stat(tmp_path):
+    path = tmp_path / "table.parquet"
+    path.write_bytes(b"content")
+    md5 = _io.cached_md5(path)
+    assert _io.cached_stat(path, "n_terms", lambda: 3) == 3
+    # the cached value is used while the file is unchanged, next to its md5
+    assert _io.cached_stat(path, "n_terms", lambda: 4) == 3
+    assert _io.cached_md5(path) == md5
+
+    path.write_bytes(b"new content")
+    assert _io.cached_stat(path, "n_terms", lambda: 4) == 4
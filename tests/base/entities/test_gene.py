@@ -111,3 +111,86 @@ def test_ensemblgene_plants():
     df = ensembl_gene.download_df()
     assert df.shape[0] == 33137
     assert "stable_id" in df.columns
+
+
+def test_resolve_legacy_id_chains():
+    from bionty.base.entities._gene import resolve_legacy_id_chains
+
+    events = pd.DataFrame(
+        {
+            "old_stable_id": ["ENSG01", "ENSG02", "ENSG02", "ENSG05", "ENSG06"],
+            "new_stable_id": ["ENSG02", "ENSG03", "ENSG04", "ENSG03", "ENSG01"],
+            "score": [0.9, 0.5, 1.0, 1.0, 1.0],
+            "mapping_session_id": [1, 2, 3, 1, 2],
+        }
+    )
+    result = resolve_legacy_id_chains(events, current_ids=["ENSG03", "ENSG04"])
+
+    pairs = {
+        (row.old_stable_id, row.new_stable_id): (row.score, row.n_hops)
+        for row in result.itertuples()
+    }
+    # two-hop chains through the retired intermediate ENSG02
+    assert pairs[("ENSG01", "ENSG04")] == (0.9, 2)
+    assert pairs[("ENSG01", "ENSG03")] == (0.45, 2)
+    assert pairs[("ENSG05", "ENSG03")] == (1.0, 1)
+    # ENSG06 -> ENSG01 happened after ENSG01 was retired, chain is not followed
+    assert "ENSG06" not in result["old_stable_id"].values
+    # best candidate comes first
+    assert result[result.old_stable_id == "ENSG01"].new_stable_id.tolist() == [
+        "ENSG04",
+        "ENSG03",
+    ]
+
+
+def test_download_legacy_ids_df_queries_chains():
+    import re
+
+    from bionty.base.entities._gene import EnsemblGene
+
+    events = pd.DataFrame(
+        {
+            "old_stable_id": ["ENSG01", "ENSG02", "ENSG05", "ENSG07"],
+            "new_stable_id": ["ENSG02", "ENSG03", "ENSG03", "ENSG08"],
+            "score": [0.9, 0.5, 1.0, 1.0],
+            "mapping_session_id": [1, 2, 1, 1],
+        }
+    )
+    queried = []
+
+    def execute_query(query):
+        new_ids = re.findall(r"'(ENSG\d+)'", query)
+        queried.append(sorted(new_ids))
+        return events[events.new_stable_id.isin(new_ids)]
+
+    # only the events into the current IDs and the intermediates are queried
+    ensembl = object.__new__(EnsemblGene)
+    ensembl._execute_query = execute_query
+    current = pd.DataFrame({"ensembl_gene_id": ["ENSG03", "ENSG04"]})
+    result = ensembl.download_legacy_ids_df(current)
+    assert queried == [["ENSG03", "ENSG04"], ["ENSG02", "ENSG05"], ["ENSG01"]]
+    assert set(zip(result.old_stable_id, result.n_hops, strict=True)) == {
+        ("ENSG01", 2),
+        ("ENSG02", 1),
+        ("ENSG05", 1),
+    }
+
+    # direct mappings of earlier legacy tables are extended with the chains
+    queried.clear()
+    direct = events[events.new_stable_id.isin(["ENSG03"])].assign(old_release="1")
+    result = ensembl.download_legacy_ids_df(current, events=direct)
+    assert queried == [["ENSG02", "ENSG05"], ["ENSG01"]]
+    assert "ENSG01" in result.old_stable_id.values
+
+    # the direct mappings are kept if the database can't be queried
+    def unreachable(query):
+        raise ConnectionError("port 5306 is blocked")
+
+    ensembl._execute_query = unreachable
+    result, complete = ensembl._download_legacy_ids(current, events=direct)
+    assert not complete
+    assert set(zip(result.old_stable_id, result.n_hops, strict=True)) == {
+        ("ENSG02", 1),
+        ("ENSG05", 1),
+    }
+    assert ensembl.download_legacy_ids_df(current).empty
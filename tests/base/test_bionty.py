@@ -34,3 +34,102 @@ def test_diff_value_errors():
     disease_bt_4 = bt_base.Disease(source="mondo", version="2023-04-04")
     with pytest.raises(ValueError):
         disease_bt_3.diff(disease_bt_4)
+
+
+def test_lazy_table(tmp_path):
+    import pandas as pd
+
+    source_path = tmp_path / "terms.parquet"
+    pd.DataFrame(
+        {"ontology_id": ["T:1", "T:2"], "name": ["a", "b"], "category": ["x", "y"]}
+    ).to_parquet(source_path)
+
+    class Terms(bt_base.PublicOntology):
+        def _match_sources(self, *args, **kwargs):
+            return {
+                "name": "terms",
+                "version": "1",
+                "organism": "all",
+                "url": source_path.as_uri(),
+            }
+
+    dynamicdir, offline = bt_base.settings.dynamicdir, bt_base.settings.offline
+    bt_base.settings.dynamicdir = tmp_path / "dynamic"
+    bt_base.settings.offline = True
+    try:
+        terms = Terms()
+        assert terms.version == "1"
+        assert "#terms: \n" in repr(terms)
+        # fields are resolved from the schema of the parquet file at the source
+        assert not hasattr(terms, "unknown")
+        assert str(terms.name) == "name"
+        # also columns that aren't common ontology fields
+        assert str(terms.category) == "category"
+        assert terms._loaded_df is None
+        assert not terms._local_parquet_path.exists()
+        assert terms.to_dataframe().shape == (2, 2)
+
+        # fields are resolved from the cached parquet file without loading it
+        terms = Terms()
+        assert terms.fields == {"ontology_id", "name", "category"}
+        assert isinstance(terms.ontology_id, bt_base.PublicOntologyField)
+        assert terms._loaded_df is None
+        with pytest.raises(AttributeError):
+            _ = terms.synonyms
+        assert terms.to_dataframe().shape == (2, 2)
+
+        # the cached table is removed with its sidecar files and lock
+        terms.clear_cache()
+        files = (tmp_path / "dynamic").rglob("*")
+        assert {file.name for file in files if file.is_file()} <= {"sources.json"}
+    finally:
+        bt_base.settings.dynamicdir = dynamicdir
+        bt_base.settings.offline = offline
+
+
+def test_md5_verification(tmp_path, monkeypatch):
+    import pandas as pd
+    from bionty.base.dev._io import file_md5
+
+    source_path = tmp_path / "terms.parquet"
+    pd.DataFrame({"ontology_id": ["T:1", "T:2"], "name": ["a", "b"]}).to_parquet(
+        source_path
+    )
+
+    class Terms(bt_base.PublicOntology):
+        def _match_sources(self, *args, **kwargs):
+            return {
+                "name": "terms",
+                "version": "1",
+                "organism": "all",
+                "url": source_path.as_uri(),
+            }
+
+    monkeypatch.setattr(bt_base.settings, "dynamicdir", tmp_path / "dynamic")
+    monkeypatch.setattr(bt_base.settings, "offline", True)
+    (tmp_path / "dynamic").mkdir()
+
+    # a truncated cached file is fetched again
+    terms = Terms(md5=file_md5(source_path))
+    terms._local_parquet_path.write_bytes(source_path.read_bytes()[:100])
+    assert terms.to_dataframe().shape == (2, 1)
+    assert terms._local_parquet_path.read_bytes() == source_path.read_bytes()
+
+    # a fetched file that doesn't match is never used
+    with pytest.raises(ValueError):
+        Terms(md5="0" * 32).to_dataframe()
+    assert not terms._local_parquet_path.exists()
+
+
+def test_read_table(tmp_path):
+    import pandas as pd
+    from bionty.base._public_ontology import _tables, read_table
+
+    path = tmp_path / "terms.parquet"
+    pd.DataFrame({"ontology_id": ["T:1", "T:2"], "name": ["a", "b"]}).to_parquet(path)
+
+    df = read_table(path)
+    df["name"] = df["name"].str.upper()
+    # the table is read once and not changed by assigning columns of a copy
+    assert read_table(path)["name"].tolist() == ["a", "b"]
+    assert sum(key[0] == path.as_posix() for key in _tables) == 1
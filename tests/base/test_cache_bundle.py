@@ -0,0 +1,91 @@
+import tarfile
+
+import bionty.base as bt_base
+import pandas as pd
+import pytest
+from bionty.base._public_ontology import encode_filenames
+from bionty.base.dev._io import _read_md5_sidecar, cached_md5
+
+
+@pytest.fixture
+def cache_settings():
+    settings = bt_base.settings
+    dynamicdir, shared_cachedir, offline = (
+        settings.dynamicdir,
+        settings.shared_cachedir,
+        settings.offline,
+    )
+    yield settings
+    settings.dynamicdir = dynamicdir
+    settings.shared_cachedir = shared_cachedir
+    settings.offline = offline
+
+
+def test_cache_bundle(tmp_path, cache_settings):
+    parquet_filename, _ = encode_filenames("all", "cl", "2025-12-17", "CellType")
+    cachedir = tmp_path / "cache"
+    cachedir.mkdir()
+    pd.DataFrame({"ontology_id": ["CL:0000000"], "name": ["cell"]}).to_parquet(
+        cachedir / parquet_filename
+    )
+    md5 = cached_md5(cachedir / parquet_filename)
+    (cachedir / f"{parquet_filename}.lock").touch()
+    (cachedir / f"{parquet_filename}.part.json").touch()
+
+    bundle = bt_base.export_cache_bundle(tmp_path / "bundle.tar", cachedir=cachedir)
+    with tarfile.open(bundle) as tar:
+        assert sorted(tar.getnames()) == [
+            parquet_filename,
+            f"{parquet_filename}.md5",
+            "manifest.json",
+        ]
+
+    shared_cachedir = tmp_path / "shared"
+    imported = bt_base.import_cache_bundle(bundle, cachedir=shared_cachedir)
+    assert imported == [
+        shared_cachedir / parquet_filename,
+        shared_cachedir / f"{parquet_filename}.md5",
+    ]
+    assert sorted(file.name for file in shared_cachedir.iterdir()) == sorted(
+        file.name for file in imported
+    )
+    # the imported md5 sidecar is valid for the imported table
+    sidecar = _read_md5_sidecar(shared_cachedir / parquet_filename)
+    assert sidecar is not None and sidecar["md5"] == md5
+
+    # the shared cache is read before the empty dynamicdir, without network access
+    cache_settings.dynamicdir = tmp_path / "dynamic"
+    cache_settings.shared_cachedir = shared_cachedir
+    cache_settings.offline = True
+    celltype = bt_base.CellType(source="cl", version="2025-12-17")
+    assert celltype.to_dataframe().index.tolist() == ["CL:0000000"]
+    assert not (tmp_path / "dynamic" / parquet_filename).exists()
+
+
+def test_import_cache_bundle_failure(tmp_path):
+    import io
+    import json
+
+    bundle = tmp_path / "bundle.tar"
+    manifest = {
+        "format_version": 1,
+        "files": [
+            {"name": "df_a.parquet", "size": 1, "md5": "0" * 32},
+            {"name": "df_b.parquet", "size": 1, "md5": "0" * 32},
+        ],
+    }
+    with tarfile.open(bundle, "w") as tar:
+        for name, content in (
+            ("df_a.parquet", b"a"),
+            ("df_b.parquet", b"b"),
+            ("manifest.json", json.dumps(manifest).encode()),
+        ):
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+
+    cachedir = tmp_path / "cache"
+    with pytest.raises(ValueError):
+        bt_base.import_cache_bundle(bundle, cachedir=cachedir)
+    # nothing is imported from a bundle that fails to import
+    assert not list(cachedir.iterdir())
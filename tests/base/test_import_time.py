@@ -0,0 +1,46 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import bionty
+
+# the parent bionty package connects to lamindb on import,
+# so bionty.base is imported under a bare parent package
+IMPORT_BIONTY_BASE = f"""
+import sys, types
+pkg = types.ModuleType("bionty")
+pkg.__path__ = [{str(Path(bionty.__file__).parent)!r}]
+sys.modules["bionty"] = pkg
+import bionty.base
+"""
+
+EAGER_IMPORTS_NOT_ALLOWED = {
+    "pandas",
+    "numpy",
+    "requests",
+    "yaml",
+    "pronto",
+    "upath",
+    "lamin_utils._lookup",
+}
+
+IMPORT_TIME_BUDGET_US = 2_000_000
+
+
+def test_import_time():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_BIONTY_BASE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # lines look like "import time:  self [us] | cumulative | imported package"
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, module = line.removeprefix("import time:").split("|")
+        cumulative[module.strip()] = int(cumulative_us)
+
+    assert EAGER_IMPORTS_NOT_ALLOWED.isdisjoint(cumulative)
+    assert cumulative["bionty.base"] < IMPORT_TIME_BUDGET_US
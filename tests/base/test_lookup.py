@@ -0,0 +1,42 @@
+import bionty.base as bt_base
+import pandas as pd
+from bionty.base._lookup import LazyLookup
+from lamin_utils._lookup import Lookup
+
+
+def test_lazy_lookup_parity():
+    df = pd.DataFrame(
+        {
+            "ontology_id": ["T:1", "T:2", "T:3", "T:4", "T:5", "T:6"],
+            "name": ["T cell", "t-cell", "1 cell", "class", None, ""],
+            "parents": [[], ["T:1"], [], [], [], []],
+        }
+    )
+    expected = Lookup(df=df, field="name", tuple_name="CellType").lookup()
+    lookup = LazyLookup(df, "name", tuple_name="CellType")
+
+    assert dir(lookup) == sorted(expected._fields)
+    for attribute in expected._fields[:-1]:
+        assert tuple(getattr(lookup, attribute)) == tuple(getattr(expected, attribute))
+    # duplicated keys return the first record
+    assert lookup.t_cell.ontology_id == "T:1"
+    # keys start with a letter, keywords get an underscore
+    assert lookup.bt_1_cell.ontology_id == "T:3"
+    assert lookup.class_.ontology_id == "T:4"
+    assert lookup.dict() == expected.dict()
+    assert lookup["t-cell"].ontology_id == "T:2"
+    assert tuple(lookup[0]) == tuple(expected[0])
+    assert lookup[1:3] == expected[1:3]
+    assert lookup[-1]() == expected[-1]()
+    assert len(lookup) == len(expected)
+    # records are created once, on access
+    lookup = LazyLookup(df, "name", tuple_name="CellType")
+    assert lookup["T cell"] is lookup.dict()["T cell"] is lookup[0]
+    assert list(lookup._records) == [0]
+
+
+def test_public_ontology_lookup():
+    lookup = bt_base.CellType().lookup()
+    record = lookup.cd103_positive_dendritic_cell
+    assert record.ontology_id == "CL:0002461"
+    assert lookup.dict()["CD103-positive dendritic cell"] == record
@@ -1,6 +1,12 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
+import requests
 from bionty.base._ontology_url import (
     OntologyNotFoundError,
+    OntologyURLError,
     OntologyVersionNotFoundError,
     get_ontology_url,
 )
@@ -50,3 +56,159 @@ def test_get_ontology_url():
         url, ver = get_ontology_url(prefix)
         assert url is not None
         assert ver is not None
+
+
+def test_get_ontology_url_cache(tmp_path, monkeypatch):
+    from bionty.base import _ontology_url, settings
+
+    calls = []
+
+    def resolve(prefix, version):
+        calls.append((prefix, version))
+        if prefix == "missing":
+            raise OntologyNotFoundError(f"ontology with prefix '{prefix}' not found")
+        if prefix == "unreachable":
+            raise requests.ConnectionError("connection refused")
+        return f"http://purl.obolibrary.org/obo/{prefix}.owl", version or "1.0"
+
+    monkeypatch.setattr(_ontology_url, "_resolve_ontology_url", resolve)
+    monkeypatch.setattr(_ontology_url, "_resolutions", {})
+    monkeypatch.setattr(settings, "dynamicdir", tmp_path)
+    monkeypatch.setattr(settings, "offline", False)
+
+    assert get_ontology_url("cached", "2.0")[1] == "2.0"
+    with pytest.raises(OntologyNotFoundError):
+        get_ontology_url("missing")
+    assert len(calls) == 2
+    # transport errors are not cached
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            get_ontology_url("unreachable")
+    assert len(calls) == 4
+
+    # a new process reads the resolutions from the dynamic directory
+    monkeypatch.setattr(_ontology_url, "_resolutions", {})
+    assert get_ontology_url("cached", "2.0")[0].endswith("cached.owl")
+    with pytest.raises(OntologyNotFoundError):
+        get_ontology_url("missing")
+    assert len(calls) == 4
+
+    # latest versions and failed resolutions expire
+    monkeypatch.setattr(settings, "assets_ttl", 0)
+    get_ontology_url("cached", "2.0")
+    with pytest.raises(OntologyNotFoundError):
+        get_ontology_url("missing")
+    assert len(calls) == 5
+
+    monkeypatch.setattr(settings, "offline", True)
+    with pytest.raises(OntologyNotFoundError):
+        get_ontology_url("missing")
+    with pytest.raises(OntologyURLError):
+        get_ontology_url("unresolved")
+    assert len(calls) == 5
+
+
+class DelayedHeadHandler(BaseHTTPRequestHandler):
+    """Responds to HEAD /{delay in seconds}/{status code}."""
+
+    def log_message(self, *args):
+        pass
+
+    requests: list[str] = []
+
+    def do_HEAD(self):
+        self.requests.append(self.path)
+        _, delay, status = self.path.split("/")
+        time.sleep(float(delay))
+        self.send_response(int(status))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DelayedHeadHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_first_existing_url(stub_server):
+    from bionty.base._ontology_url import _first_existing_url
+
+    missing = [f"{stub_server}/0.3/404", f"{stub_server}/0.3/404"]
+    start = time.perf_counter()
+    assert _first_existing_url([*missing, f"{stub_server}/0.3/200"]).endswith("200")
+    assert _first_existing_url(missing) is None
+    # the probes are concurrent
+    assert time.perf_counter() - start < 2
+
+    # the order of the urls is kept
+    preferred = f"{stub_server}/0.3/200"
+    assert _first_existing_url([preferred, f"{stub_server}/0/200"]) == preferred
+    # without waiting for the less preferred urls
+    start = time.perf_counter()
+    assert _first_existing_url([f"{stub_server}/0/200", f"{stub_server}/2/200"])
+    assert time.perf_counter() - start < 1
+
+    # all urls are probed at once
+    DelayedHeadHandler.requests.clear()
+    start = time.perf_counter()
+    urls = [
+        f"{stub_server}/1/404",
+        f"{stub_server}/1/404",
+        f"{stub_server}/1/200",
+    ]
+    assert _first_existing_url(urls) == urls[-1]
+    assert time.perf_counter() - start < 2
+    assert len(DelayedHeadHandler.requests) == 3
+
+    # urls that can't be probed are skipped
+    urls = [f"{stub_server}/0/503", f"{stub_server}/0/403", f"{stub_server}/0/200"]
+    assert _first_existing_url(urls) == urls[-1]
+    # the error is only raised if no url exists
+    with pytest.raises(requests.HTTPError):
+        _first_existing_url([f"{stub_server}/0/503", f"{stub_server}/0/404"])
+
+
+def test_resolve_ontology_url_checks_prefix_concurrently(monkeypatch):
+    from bionty.base import _ontology_url
+
+    def prefix_exists(prefix):
+        time.sleep(0.5)
+        return prefix != "missing"
+
+    def get_specific_version(prefix, version):
+        time.sleep(0.5)
+        if prefix == "unreachable":
+            raise requests.ConnectionError("connection refused")
+        if version == "1.0":
+            return f"http://purl.obolibrary.org/obo/{prefix}.owl", version
+        return None, None
+
+    monkeypatch.setattr(_ontology_url, "_prefix_exists", prefix_exists)
+    monkeypatch.setattr(_ontology_url, "_get_specific_version", get_specific_version)
+    # bioregistry loads its registry once
+    _ontology_url.import_bioregistry().normalize_prefix("cl")
+
+    start = time.perf_counter()
+    with pytest.raises(OntologyNotFoundError):
+        _ontology_url._resolve_ontology_url("missing", "2.0")
+    assert time.perf_counter() - start < 0.9
+    with pytest.raises(OntologyVersionNotFoundError):
+        _ontology_url._resolve_ontology_url("cl", "2.0")
+    with pytest.raises(requests.ConnectionError):
+        _ontology_url._resolve_ontology_url("unreachable", "1.0")
+    assert _ontology_url._resolve_ontology_url("cl", "1.0")[1] == "1.0"
+
+
+def test_url_exists_no_retries(stub_server):
+    from bionty.base._ontology_url import _url_exists
+
+    DelayedHeadHandler.requests.clear()
+    with pytest.raises(requests.HTTPError):
+        _url_exists(f"{stub_server}/0/503")
+    # existence probes are not retried
+    assert DelayedHeadHandler.requests == ["/0/503"]
+    assert not _url_exists(f"{stub_server}/0/404")
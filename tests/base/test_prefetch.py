@@ -0,0 +1,38 @@
+import json
+
+import bionty.base as bt_base
+import pandas as pd
+from bionty.base._public_ontology import encode_filenames
+
+
+def test_prefetch_sources(tmp_path, monkeypatch):
+    monkeypatch.setattr(bt_base.settings, "dynamicdir", tmp_path)
+    monkeypatch.setattr(bt_base.settings, "offline", True)
+    parquet_filename, _ = encode_filenames("all", "cl", "2025-12-17", "CellType")
+    pd.DataFrame({"ontology_id": ["CL:0000000"], "name": ["cell"]}).to_parquet(
+        tmp_path / parquet_filename
+    )
+
+    sources = [
+        {
+            "entity": "CellType",
+            "organism": "all",
+            "name": "cl",
+            "version": "2025-12-17",
+        },
+        # not cached and can't be downloaded offline
+        {
+            "entity": "bionty.Tissue",
+            "organism": "all",
+            "name": "uberon",
+            "version": "2025-05-28",
+        },
+    ]
+    manifest = bt_base.prefetch_sources(sources, manifest=tmp_path / "manifest.json")
+
+    assert manifest["entity"].tolist() == ["CellType", "Tissue"]
+    cached, failed = json.loads((tmp_path / "manifest.json").read_text())
+    assert cached["size"] == (tmp_path / parquet_filename).stat().st_size
+    assert len(cached["md5"]) == 32
+    assert cached["error"] is None
+    assert failed["error"].startswith("ConnectionError")
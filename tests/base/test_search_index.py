@@ -0,0 +1,80 @@
+import bionty.base as bt_base
+import pandas as pd
+import pytest
+from bionty.base._search_index import SearchIndex, search_fields, search_many
+from lamin_utils._search import search
+
+
+def assert_same_ranking(df: pd.DataFrame, string: str, **kwargs):
+    index = SearchIndex(df)
+    field = kwargs.pop("field", None)
+    fields = search_fields(df, field)
+    expected = search(df, string, field=field, limit=None, _show_rank=True, **kwargs)
+    result = search(
+        df.iloc[index.candidates(string, fields)],
+        string,
+        field=field,
+        limit=None,
+        _show_rank=True,
+        **kwargs,
+    )
+    if expected.empty:
+        assert result.empty
+        return
+    # rows of the same rank can be in a different order
+    assert sorted(zip(result["rank"], result.index, strict=True)) == sorted(
+        zip(expected["rank"], expected.index, strict=True)
+    )
+    assert result["rank"].tolist() == expected["rank"].tolist()
+
+
+def test_search_index_parity():
+    df = pd.DataFrame(
+        {
+            "ontology_id": ["T:1", "T:2", "T:3", "T:4", "T:5"],
+            "name": ["T cell", "gamma-delta T cell", "B cell", "cell", "Tcell"],
+            "synonyms": ["T-cell|T lymphocyte", None, "B lymphocyte", "", "t cell"],
+            "parents": [["T:4"], ["T:1"], ["T:4"], [], ["T:4"]],
+        }
+    )
+    for string in ["T cell", "t cell", "cell", "T:4", "lymph", "T", "", "nothing"]:
+        assert_same_ranking(df, string)
+        assert_same_ranking(df, string, case_sensitive=True)
+        assert_same_ranking(df, string, field=["name", "synonyms"])
+
+
+@pytest.mark.parametrize(
+    "entity, queries",
+    [
+        ("CellType", ["T cell", "gamma delta T cell", "neuron", "CL:0000084"]),
+        ("Disease", ["cancer", "type 2 diabetes mellitus", "MONDO:0005148"]),
+        ("Tissue", ["brain", "heart left ventricle"]),
+    ],
+)
+def test_search_parity_public_ontologies(entity, queries):
+    public = getattr(bt_base, entity)()
+    for string in queries:
+        assert_same_ranking(public._df, string)
+        assert_same_ranking(public._df, string, field="name")
+
+
+def test_search_many():
+    df = pd.DataFrame(
+        {
+            "ontology_id": ["T:1", "T:2", "T:3", "T:4"],
+            "name": ["T cell", "gamma-delta T cell", "B cell", "cell"],
+            "synonyms": ["T-cell|T lymphocyte", None, "B lymphocyte", ""],
+        }
+    )
+    strings = ["T cell", "lymphocyte", "nothing", "T cell"]
+    serial = search_many(df, strings, limit=2)
+    assert serial.columns.tolist() == ["query", "ontology_id", "score", "rank"]
+    assert serial["query"].unique().tolist() == ["T cell", "lymphocyte"]
+    for string, hits in serial.groupby("query", sort=False):
+        expected = search(df, string, limit=2, _show_rank=True)
+        assert hits["ontology_id"].tolist() == expected["ontology_id"].tolist()
+        assert hits["score"].tolist() == expected["rank"].tolist()
+        assert hits["rank"].tolist() == [1, 2]
+
+    parallel = search_many(df, strings, limit=2, n_workers=2)
+    pd.testing.assert_frame_equal(parallel, serial)
@@ -0,0 +1,43 @@
+import bionty as bt
+import lamindb as ln
+
+
+def test_search_index():
+    records = [
+        bt.Ethnicity(
+            name=name,
+            ontology_id=f"HANCESTRO:{i:04d}",
+            synonyms=synonyms,
+            _skip_validation=True,
+        )
+        for i, (name, synonyms) in enumerate(
+            [
+                ("South Asian", "South-Asian|Indian subcontinent"),
+                ("East Asian", None),
+                ("European", "Caucasian"),
+            ]
+        )
+    ]
+    ln.save(records)
+
+    # candidates come from the search index
+    assert "bionty_ethnicity_search" in str(bt.Ethnicity.search("asian").query)
+    results = list(bt.Ethnicity.search("asian").values_list("name", flat=True))
+    # "European" matches via its synonym "Caucasian"
+    assert set(results) == {"South Asian", "East Asian", "European"}
+    assert results[-1] == "European"
+    assert bt.Ethnicity.search("subcontinent").one().name == "South Asian"
+    assert bt.Ethnicity.search("European", case_sensitive=True).one().name == "European"
+    # strings that are too short are searched without index
+    assert bt.Ethnicity.search("ea").count() == 2
+
+    # the index is kept in sync with the table
+    european = bt.Ethnicity.get(name="European")
+    european.synonyms = "Western"
+    european.save()
+    assert not bt.Ethnicity.search("caucasian").exists()
+    assert bt.Ethnicity.search("western").one().name == "European"
+    european.delete(permanent=True)
+    assert not bt.Ethnicity.search("western").exists()
+
+    bt.Ethnicity.filter().delete(permanent=True)
@@ -243,6 +243,93 @@ def test_sync_public_sources():
     assert source_cl_latest != source_ct_2024_05_15
 
 
+def test_sync_public_sources_restores_sources():
+    source = bt.Source.get(entity="bionty.CellType", name="cl", currently_used=True)
+    description = source.description
+    source.description = "outdated description"
+    source.save()
+    old_source = bt.Source(
+        entity="bionty.CellType",
+        name="cl",
+        organism="all",
+        version="2000-01-01",
+    ).save()
+    old_source.currently_used = True
+    old_source.save()
+    source.refresh_from_db()
+    source.delete()  # moves it to the trash
+    assert not bt.Source.objects.get(id=source.id).currently_used
+
+    bt.core.sync_public_sources(update_currently_used=True)
+    source = bt.Source.objects.get(id=source.id)
+    assert source.branch_id == 1
+    assert source.description == description
+    assert source.currently_used
+    assert not bt.Source.get(id=old_source.id).currently_used
+    old_source.delete(permanent=True)
+
+
+def test_source_save_and_set_currently_used():
+    from bionty.core import set_currently_used
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    source = bt.Source.get(entity="bionty.Disease", name="mondo", currently_used=True)
+    # unchanged sources aren't written
+    with CaptureQueriesContext(connection) as queries:
+        source.save()
+    assert len(queries) == 0
+
+    old_source = bt.Source(
+        entity="bionty.Disease", name="mondo", organism="all", version="2000-01-01"
+    ).save()
+    set_currently_used([old_source])
+    assert old_source.currently_used
+    assert not bt.Source.get(id=source.id).currently_used
+    with pytest.raises(ValueError, match="only one version of mondo"):
+        set_currently_used([old_source, source])
+
+    source.refresh_from_db()
+    source.currently_used = True
+    source.save()
+    assert not bt.Source.get(id=old_source.id).currently_used
+    old_source.delete(permanent=True)
+
+
+def test_check_source_in_db():
+    from bionty.core._add_ontology import check_source_in_db
+
+    source = bt.Source(
+        entity="bionty.Ethnicity",
+        name="internal-ethnicity",
+        version="3",
+        organism="human",
+    ).save()
+    source = bt.Ethnicity.add_source(
+        source,
+        df=pd.DataFrame(
+            {
+                "ontology_id": ["HANCESTRO:9101", "HANCESTRO:9102", "HANCESTRO:9103"],
+                "name": ["Martian", "Venusian", "obsolete Lunar"],
+            }
+        ),
+    )
+    bt.Ethnicity.from_values(
+        ["HANCESTRO:9101"], field=bt.Ethnicity.ontology_id, source=source
+    ).save()
+    # obsolete terms aren't counted
+    assert bt.Ethnicity.public(source=source)._n_terms(exclude_obsolete=True) == 2
+    check_source_in_db(bt.Ethnicity, source)
+    assert not source.in_db
+
+    bt.Ethnicity.import_source(source=source)
+    check_source_in_db(bt.Ethnicity, source)
+    assert bt.Source.get(id=source.id).in_db
+
+    bt.Ethnicity.filter(source=source).delete(permanent=True)
+    source.delete(permanent=True)
+
+
 def test_import_source_update_records():
     import lamindb as ln
 
@@ -276,3 +363,68 @@ def test_import_source_no_prefix_filter():
     source = bt.ExperimentalFactor.add_source(source="efo", df=efo_ontology_df)
     bt.ExperimentalFactor.import_source(source=source)
     assert bt.ExperimentalFactor.filter().count() == 66971
+
+
+def test_update_records_to_source():
+    import lamindb as ln
+
+    def add_source(version: str, df: pd.DataFrame):
+        source = bt.Source(
+            entity="bionty.Ethnicity",
+            name="internal-ethnicity",
+            version=version,
+            organism="human",
+            description="internal ethnicity reference",
+        ).save()
+        return bt.Ethnicity.add_source(source, df=df)
+
+    source1 = add_source(
+        "1",
+        pd.DataFrame(
+            {
+                "ontology_id": ["HANCESTRO:9001", "HANCESTRO:9002", "HANCESTRO:9003"],
+                "name": ["Martian", "Venusian", "Lunar"],
+                "synonyms": ["red planet", "morning star", "moon"],
+            }
+        ),
+    )
+    source2 = add_source(
+        "2",
+        pd.DataFrame(
+            {
+                "ontology_id": ["HANCESTRO:9001", "HANCESTRO:9002", "HANCESTRO:9003"],
+                "name": ["Martian", "Venus native", "Selenite"],
+                "synonyms": ["red planet|mars", "morning star", "moon"],
+            }
+        ),
+    )
+    bt.Ethnicity.import_source(source=source1)
+    artifact = ln.Artifact(
+        pd.DataFrame({"a": [1, 2, 3]}), key="test-update-to-source.parquet"
+    ).save()
+    artifact.ethnicities.add(bt.Ethnicity.get(ontology_id="HANCESTRO:9003"))
+
+    # nothing is written when planning
+    plan = bt.core.plan_records_to_source(bt.Ethnicity, source2)
+    assert plan.updates["ontology_id"].tolist() == ["HANCESTRO:9001", "HANCESTRO:9002"]
+    assert plan.changed_counts() == {"synonyms": 1, "name": 1}
+    assert plan.forks == ["HANCESTRO:9003"]
+    assert plan.obsolete == []
+    assert bt.Ethnicity.get(ontology_id="HANCESTRO:9001").source == source1
+
+    plan.execute()
+    # changed fields are updated
+    martian = bt.Ethnicity.get(ontology_id="HANCESTRO:9001")
+    assert martian.source == source2
+    assert martian.synonyms == "red planet|mars"
+    assert bt.Ethnicity.standardize(["mars"], from_source=False) == ["Martian"]
+    venusian = bt.Ethnicity.get(ontology_id="HANCESTRO:9002")
+    assert venusian.source == source2
+    assert venusian.name == "Venus native"
+    # records with artifacts and a changed name are kept
+    assert bt.Ethnicity.get(ontology_id="HANCESTRO:9003").source == source1
+
+    artifact.delete(permanent=True)
+    bt.Ethnicity.filter(ontology_id__startswith="HANCESTRO:900").delete(permanent=True)
+    for source in [source1, source2]:
+        source.delete(permanent=True)
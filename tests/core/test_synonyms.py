@@ -0,0 +1,69 @@
+import bionty as bt
+import lamindb as ln
+from bionty.models import Synonym
+
+
+def test_synonym_index():
+    records = [
+        bt.Ethnicity(
+            name=name,
+            ontology_id=f"HANCESTRO:{i:04d}",
+            synonyms=synonyms,
+            _skip_validation=True,
+        )
+        for i, (name, synonyms) in enumerate(
+            [("South Asian", "Indian subcontinent|SAS"), ("European", "Caucasian")]
+        )
+    ]
+    # bulk created records are marked as stale
+    ln.save(records)
+    stale = Synonym.filter(registry="bionty.Ethnicity", term__isnull=True)
+    assert stale.count() == 2
+    assert bt.Ethnicity.standardize(
+        ["sas", "caucasian", "european", "unknown"], from_source=False
+    ) == ["South Asian", "European", "European", "unknown"]
+
+    # the terms of saved records are replaced, stale records are indexed along
+    european = bt.Ethnicity.get(name="European")
+    european.synonyms = "Western"
+    european.save()
+    assert not stale.exists()
+    ids = bt.Ethnicity.filter(name__in=["South Asian", "European"]).values("id")
+    assert set(
+        Synonym.filter(registry="bionty.Ethnicity", record_id__in=ids).values_list(
+            "term", flat=True
+        )
+    ) == {"south asian", "indian subcontinent", "sas", "european", "western"}
+    assert bt.Ethnicity.standardize(
+        ["western", "caucasian"], return_mapper=True, from_source=False
+    ) == {"western": "European"}
+
+    # unchanged records aren't reindexed
+    european.description = "unrelated change"
+    european.save()
+    assert Synonym.filter(registry="bionty.Ethnicity").count() == 5
+
+    # records changed by bulk updates are marked as stale
+    bt.Ethnicity.filter(name="European").update(synonyms="Occidental")
+    south_asian = bt.Ethnicity.get(name="South Asian")
+    south_asian.synonyms = "Desi"
+    ln.save([south_asian])
+    assert stale.count() == 2
+    # standardize doesn't write, it doesn't use the index while records are stale
+    n_rows = Synonym.filter(registry="bionty.Ethnicity").count()
+    assert bt.Ethnicity.standardize(
+        ["occidental", "western", "desi", "sas"], return_mapper=True, from_source=False
+    ) == {"occidental": "European", "desi": "South Asian"}
+    assert Synonym.filter(registry="bionty.Ethnicity").count() == n_rows
+    # stale records are indexed along with saved records
+    bt.Ethnicity(
+        name="East Asian", ontology_id="HANCESTRO:0009", _skip_validation=True
+    ).save()
+    assert not stale.exists()
+    assert bt.Ethnicity.standardize(
+        ["occidental", "desi", "east asian"], from_source=False
+    ) == ["European", "South Asian", "East Asian"]
+
+    # the terms of deleted records are removed
+    bt.Ethnicity.filter().delete(permanent=True)
+    assert not Synonym.filter(registry="bionty.Ethnicity").exists()